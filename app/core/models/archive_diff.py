@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class ArchiveDiff:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+    
+    def to_dict(self):
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+        }
@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class DependencyResolution:
+    # Disabled mods to enable, in an order that satisfies their requirements
+    to_enable: List[str] = field(default_factory=list)
+    # The whole enabled order once they are enabled
+    order: List[str] = field(default_factory=list)
+    # Why some requirements cannot be met, if any
+    conflicts: List[str] = field(default_factory=list)
+    
+    @property
+    def is_satisfiable(self) -> bool:
+        return not self.conflicts
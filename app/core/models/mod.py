@@ -1,36 +1,149 @@
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+import sys
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from app.core.models.mod_requirement import ModRequirement
+
+MetadataLoader = Callable[[], Tuple[Dict[str, Any], Optional[str]]]
+DescriptionLoader = Callable[[], str]
 
 
-@dataclass
 class Mod:
-    name: str
-    path: str
-    enabled: bool = False
-    missing: bool = False
-    metadata: Optional[Dict[str, Any]] = None
-    preview_path: Optional[str] = None
-    has_unmet_requirements: bool = False
+    """
+    A mod folder and the fields of its description metadata.
+    
+    Title, author, version, url and the parsed requirements are extracted
+    once into slots. When a loader is given, the raw metadata is not kept:
+    it is fetched again through the loader when asked for. Without metadata
+    the loader is also called lazily the first time any metadata field is
+    read. The description, usually the largest part, is never stored; it
+    comes from description_loader, which reads it from disk, on each access.
+    """
+    
+    __slots__ = (
+        "name",
+        "path",
+        "enabled",
+        "missing",
+        "has_unmet_requirements",
+        "_loader",
+        "_description_loader",
+        "_loaded",
+        "_metadata",
+        "_preview_path",
+        "_title",
+        "_author",
+        "_version",
+        "_url",
+        "_requirements",
+        "_parsed_requirements",
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        enabled: bool = False,
+        missing: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+        preview_path: Optional[str] = None,
+        has_unmet_requirements: bool = False,
+        loader: Optional[MetadataLoader] = None,
+        description_loader: Optional[DescriptionLoader] = None
+    ):
+        # Names are compared and hashed constantly; authors repeat across mods
+        self.name = sys.intern(name)
+        self.path = path
+        self.enabled = enabled
+        self.missing = missing
+        self.has_unmet_requirements = has_unmet_requirements
+        self._loader = loader
+        self._description_loader = description_loader
+        self._loaded = False
+        self._preview_path = preview_path
+        
+        if metadata is not None or loader is None:
+            self._set_metadata(metadata)
+    
+    def __repr__(self) -> str:
+        return f"Mod(name={self.name!r}, enabled={self.enabled!r}, missing={self.missing!r})"
+    
+    def _set_metadata(self, metadata: Optional[Dict[str, Any]]):
+        if metadata is None:
+            metadata = {}
+        
+        self._title = metadata.get("title") or metadata.get("name") or self.name
+        author = metadata.get("author", "Unknown")
+        self._author = sys.intern(author) if isinstance(author, str) else author
+        self._version = metadata.get("version", "Unknown")
+        self._url = metadata.get("url", "")
+        
+        reqs = metadata.get("requirements", [])
+        self._requirements = reqs if isinstance(reqs, list) else []
+        parsed = (ModRequirement.from_item(item) for item in self._requirements)
+        self._parsed_requirements = tuple(req for req in parsed if req is not None)
+        
+        # Without a loader there is nowhere to fetch the rest from later
+        self._metadata = metadata if self._loader is None else None
+        self._loaded = True
+    
+    def apply_metadata(self, metadata: Optional[Dict[str, Any]]):
+        """
+        Refresh title, author, version, url and requirements from newly read metadata.
+        
+        Only the extracted fields change. A mod with a loader does not keep
+        the dict, so metadata and description still come from its loaders.
+        """
+        self._set_metadata(metadata)
+    
+    def _ensure_loaded(self):
+        if not self._loaded:
+            metadata, self._preview_path = self._loader()
+            self._set_metadata(metadata)
     
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        if self._metadata is not None:
+            return self._metadata
+        metadata, _ = self._loader()
+        return metadata
+    
+    @property
+    def preview_path(self) -> Optional[str]:
+        self._ensure_loaded()
+        return self._preview_path
+    
+    @preview_path.setter
+    def preview_path(self, value: Optional[str]):
+        self._ensure_loaded()
+        self._preview_path = value
     
     @property
     def title(self) -> str:
-        return self.metadata.get("title") or self.metadata.get("name") or self.name
+        self._ensure_loaded()
+        return self._title
     
     @property
     def author(self) -> str:
-        return self.metadata.get("author", "Unknown")
+        self._ensure_loaded()
+        return self._author
     
     @property
     def version(self) -> str:
-        return self.metadata.get("version", "Unknown")
+        self._ensure_loaded()
+        return self._version
     
     @property
     def description(self) -> str:
-        return self.metadata.get("description", "")
+        self._ensure_loaded()
+        if self._metadata is not None:
+            return self._metadata.get("description", "")
+        if self._description_loader is not None:
+            return self._description_loader()
+        return ""
     
     # TEMPORARILY DISABLED: Not functional in game yet
     # @property
@@ -43,14 +156,18 @@ class Mod:
     
     @property
     def url(self) -> str:
-        return self.metadata.get("url", "")
+        self._ensure_loaded()
+        return self._url
     
     @property
     def requirements(self) -> List[Dict[str, str]]:
-        reqs = self.metadata.get("requirements", [])
-        if not isinstance(reqs, list):
-            return []
-        return reqs
+        self._ensure_loaded()
+        return self._requirements
+    
+    @property
+    def parsed_requirements(self) -> Tuple[ModRequirement, ...]:
+        self._ensure_loaded()
+        return self._parsed_requirements
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Set
+
+
+@dataclass
+class ModFolderChanges:
+    modlist_changed: bool = False
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    modified: Set[str] = field(default_factory=set)
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.modlist_changed or self.added or self.removed or self.modified)
+    
+    def merge(self, other: "ModFolderChanges"):
+        self.modlist_changed = self.modlist_changed or other.modlist_changed
+        for name in other.added:
+            self.removed.discard(name)
+            self.added.add(name)
+        for name in other.removed:
+            self.added.discard(name)
+            self.modified.discard(name)
+            self.removed.add(name)
+        self.modified |= other.modified - self.removed
@@ -1,18 +1,98 @@
-from typing import List, Optional, Callable
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from app.core.models.mod import Mod
+from app.core.models.mod_list_changes import ModListChanges
+from app.core.models.mod_load_error import ModLoadError
+from app.core.models.requirement_graph import RequirementGraph
 
 
 class ModList:
-    def __init__(self, mods: Optional[List[Mod]] = None):
+    """
+    Ordered collection of mods with change notification.
+    
+    The list keeps a name index, the enabled load order with each mod's
+    position in it, and the enabled/disabled/missing views. All of them
+    are rebuilt lazily after a mutation, except that moving a mod up or
+    down swaps the affected entries in place.
+    """
+    
+    def __init__(self, mods: Optional[List[Mod]] = None, load_errors: Optional[List[ModLoadError]] = None):
         self._mods: List[Mod] = mods or []
         self._observers: List[Callable] = []
+        self.load_errors: List[ModLoadError] = load_errors if load_errors is not None else []
+        self._batch_depth = 0
+        self._pending: Optional[ModListChanges] = None
+        self.requirement_graph = RequirementGraph()
+        # Requirement errors per enabled mod, kept by ModService's validation
+        self.requirement_errors: Dict[str, List[str]] = {}
+        self._reindex()
     
     def add_observer(self, callback: Callable):
         self._observers.append(callback)
     
-    def _notify_observers(self):
+    def _notify_observers(self, changes: ModListChanges):
+        if self._batch_depth:
+            if self._pending is None:
+                self._pending = ModListChanges(from_disk=True)
+            self._pending.merge(changes)
+            return
+        
         for callback in self._observers:
-            callback()
+            callback(changes)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group mutations so observers are notified once when the batch ends.
+        
+        Observers receive the merged changes of everything done inside the
+        batch, and are not called at all if nothing changed. Batches can be
+        nested; only the outermost one notifies.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                changes, self._pending = self._pending, None
+                if changes is not None and not changes.is_empty:
+                    self._notify_observers(changes)
+    
+    def _reindex(self):
+        # The first mod wins if a name appears twice, as with a linear search
+        self._index: Dict[str, Mod] = {}
+        for mod in self._mods:
+            self._index.setdefault(mod.name, mod)
+        self._invalidate()
+    
+    def _invalidate(self):
+        self._positions: Optional[Dict[Mod, int]] = None
+        self._enabled: Optional[List[Mod]] = None
+        self._enabled_positions: Optional[Dict[str, int]] = None
+        self._views: Optional[Tuple[List[Mod], List[Mod], List[Mod]]] = None
+    
+    def _ensure_order(self):
+        if self._enabled is not None:
+            return
+        self._positions = {mod: i for i, mod in enumerate(self._mods)}
+        self._enabled = [mod for mod in self._mods if mod.enabled]
+        self._enabled_positions = {}
+        for i, mod in enumerate(self._enabled):
+            self._enabled_positions.setdefault(mod.name, i)
+    
+    def _ensure_views(self) -> Tuple[List[Mod], List[Mod], List[Mod]]:
+        if self._views is None:
+            enabled, disabled, missing = [], [], []
+            for mod in self._mods:
+                if not mod.enabled:
+                    disabled.append(mod)
+                elif mod.missing:
+                    missing.append(mod)
+                else:
+                    enabled.append(mod)
+            self._views = (enabled, disabled, missing)
+        return self._views
     
     @property
     def all_mods(self) -> List[Mod]:
@@ -20,76 +100,96 @@ class ModList:
     
     @property
     def enabled_mods(self) -> List[Mod]:
-        return [mod for mod in self._mods if mod.enabled and not mod.missing]
+        return self._ensure_views()[0].copy()
     
     @property
     def disabled_mods(self) -> List[Mod]:
-        return [mod for mod in self._mods if not mod.enabled]
+        return self._ensure_views()[1].copy()
     
     @property
     def missing_mods(self) -> List[Mod]:
-        return [mod for mod in self._mods if mod.enabled and mod.missing]
+        return self._ensure_views()[2].copy()
     
     @property
     def enabled_mod_names(self) -> List[str]:
-        return [mod.name for mod in self._mods if mod.enabled]
+        self._ensure_order()
+        return [mod.name for mod in self._enabled]
     
     def get_mod_by_name(self, name: str) -> Optional[Mod]:
-        for mod in self._mods:
-            if mod.name == name:
-                return mod
-        return None
+        return self._index.get(name)
     
     def enable_mod(self, mod_name: str):
         mod = self.get_mod_by_name(mod_name)
         if mod and not mod.enabled:
             mod.enabled = True
-            self._notify_observers()
+            self._invalidate()
+            self._notify_observers(ModListChanges(enabled={mod.name}))
     
     def disable_mod(self, mod_name: str):
         mod = self.get_mod_by_name(mod_name)
         if mod and mod.enabled:
             mod.enabled = False
-            self._notify_observers()
+            self._invalidate()
+            self._notify_observers(ModListChanges(disabled={mod.name}))
     
     def enable_all(self):
+        changes = ModListChanges()
         for mod in self._mods:
-            if not mod.missing:
+            if not mod.missing and not mod.enabled:
                 mod.enabled = True
-        self._notify_observers()
+                changes.enabled.add(mod.name)
+        self._invalidate()
+        self._notify_observers(changes)
     
     def disable_all(self):
+        changes = ModListChanges()
         for mod in self._mods:
-            mod.enabled = False
-        self._notify_observers()
+            if mod.enabled:
+                mod.enabled = False
+                changes.disabled.add(mod.name)
+        self._invalidate()
+        self._notify_observers(changes)
+    
+    def load_position(self, mod_name: str) -> Optional[int]:
+        """Position of an enabled, present mod in the load order, or None."""
+        self._ensure_order()
+        index = self._enabled_positions.get(mod_name)
+        if index is None or self._enabled[index].missing:
+            return None
+        return index
+    
+    def _swap_enabled(self, index: int, other: int):
+        # Swap two mods of the enabled order, both there and in the full list
+        mod, other_mod = self._enabled[index], self._enabled[other]
+        pos, other_pos = self._positions[mod], self._positions[other_mod]
+        
+        self._mods[pos], self._mods[other_pos] = other_mod, mod
+        self._positions[mod], self._positions[other_mod] = other_pos, pos
+        self._enabled[index], self._enabled[other] = other_mod, mod
+        if self._enabled_positions.get(mod.name) == index:
+            self._enabled_positions[mod.name] = other
+        if self._enabled_positions.get(other_mod.name) == other:
+            self._enabled_positions[other_mod.name] = index
+        
+        self._views = None
     
     def move_up(self, mod_name: str):
-        enabled = [m for m in self._mods if m.enabled]
-        index = next((i for i, m in enumerate(enabled) if m.name == mod_name), None)
+        self._ensure_order()
+        index = self._enabled_positions.get(mod_name)
         
         if index is not None and index > 0:
-            all_mods = self._mods.copy()
-            
-            old_idx = all_mods.index(enabled[index])
-            target_idx = all_mods.index(enabled[index - 1])
-            
-            all_mods[old_idx], all_mods[target_idx] = all_mods[target_idx], all_mods[old_idx]
-            self._mods = all_mods
-            self._notify_observers()
+            moved = {mod_name, self._enabled[index - 1].name}
+            self._swap_enabled(index, index - 1)
+            self._notify_observers(ModListChanges(moved=moved, reordered=True))
     
     def move_down(self, mod_name: str):
-        enabled = [m for m in self._mods if m.enabled]
-        index = next((i for i, m in enumerate(enabled) if m.name == mod_name), None)
+        self._ensure_order()
+        index = self._enabled_positions.get(mod_name)
         
-        if index is not None and index < len(enabled) - 1:
-            all_mods = self._mods.copy()
-            
-            old_idx = all_mods.index(enabled[index])
-            target_idx = all_mods.index(enabled[index + 1])
-            
-            all_mods[old_idx], all_mods[target_idx] = all_mods[target_idx], all_mods[old_idx]
-            self._mods = all_mods
-            self._notify_observers()
+        if index is not None and index < len(self._enabled) - 1:
+            moved = {mod_name, self._enabled[index + 1].name}
+            self._swap_enabled(index, index + 1)
+            self._notify_observers(ModListChanges(moved=moved, reordered=True))
     
     def move_to_top(self, mod_name: str):
         mod = self.get_mod_by_name(mod_name)
@@ -98,7 +198,8 @@ class ModList:
             
             first_enabled_idx = next((i for i, m in enumerate(self._mods) if m.enabled), len(self._mods))
             self._mods.insert(first_enabled_idx, mod)
-            self._notify_observers()
+            self._invalidate()
+            self._notify_observers(ModListChanges(moved={mod.name}, reordered=True))
     
     def move_to_bottom(self, mod_name: str):
         mod = self.get_mod_by_name(mod_name)
@@ -107,24 +208,117 @@ class ModList:
             
             last_enabled_idx = next((i for i in range(len(self._mods) - 1, -1, -1) if self._mods[i].enabled), -1)
             self._mods.insert(last_enabled_idx + 1, mod)
-            self._notify_observers()
+            self._invalidate()
+            self._notify_observers(ModListChanges(moved={mod.name}, reordered=True))
     
     def set_order(self, enabled_names: List[str]):
         enabled_map = {mod.name: mod for mod in self._mods if mod.enabled}
         disabled_mods = [mod for mod in self._mods if not mod.enabled]
         
         new_enabled = []
+        placed = set()
         for name in enabled_names:
-            if name in enabled_map:
-                new_enabled.append(enabled_map[name])
+            mod = enabled_map.get(name)
+            if mod is not None and mod not in placed:
+                new_enabled.append(mod)
+                placed.add(mod)
         
         for mod in enabled_map.values():
-            if mod not in new_enabled:
+            if mod not in placed:
                 new_enabled.append(mod)
         
         self._mods = new_enabled + disabled_mods
-        self._notify_observers()
+        self._invalidate()
+        self._notify_observers(ModListChanges(reordered=True))
     
     def replace_mods(self, mods: List[Mod]):
+        old_names = set(self._index)
         self._mods = mods
-        self._notify_observers()
+        self._reindex()
+        self.requirement_graph.clear()
+        self._notify_observers(ModListChanges(
+            added=set(self._index) - old_names,
+            removed=old_names - set(self._index),
+            reordered=True,
+        ))
+    
+    def patch(
+        self,
+        added: Iterable[Mod] = (),
+        removed: Iterable[str] = (),
+        updated: Iterable[str] = (),
+        enabled_names: Optional[List[str]] = None
+    ) -> ModListChanges:
+        """
+        Apply changes found in the mod folder in place, notifying observers once.
+        
+        Args:
+            added: New mods. Disabled ones are inserted in name order, enabled
+                ones must also appear in enabled_names.
+            removed: Mods whose folder is gone. Enabled mods stay in the list
+                marked missing, disabled ones are dropped.
+            updated: Mods whose metadata was already refreshed in place.
+            enabled_names: The new modlist.txt order, if it changed.
+            
+        Returns:
+            The changes that were applied; observers are not called if empty.
+        """
+        changes = ModListChanges(updated=set(updated), from_disk=True)
+        old_enabled = self.enabled_mod_names
+        
+        removed = set(removed)
+        if removed:
+            kept = []
+            for mod in self._mods:
+                if mod.name in removed:
+                    if mod.enabled and not mod.missing:
+                        mod.missing = True
+                        mod.apply_metadata({})
+                        mod.preview_path = None
+                        changes.removed.add(mod.name)
+                        changes.updated.discard(mod.name)
+                    elif not mod.enabled:
+                        changes.removed.add(mod.name)
+                        continue
+                kept.append(mod)
+            self._mods = kept
+        
+        for mod in added:
+            changes.added.add(mod.name)
+            if mod.enabled:
+                # Placed below with the rest of the enabled order
+                self._mods.append(mod)
+                continue
+            index = next((i for i, m in enumerate(self._mods) if not m.enabled and m.name > mod.name), len(self._mods))
+            self._mods.insert(index, mod)
+        
+        if enabled_names is not None:
+            by_name = {mod.name: mod for mod in self._mods}
+            
+            enabled = []
+            for name in dict.fromkeys(enabled_names):
+                mod = by_name.pop(name, None)
+                if mod is not None:
+                    mod.enabled = True
+                    enabled.append(mod)
+            
+            disabled = []
+            for mod in by_name.values():
+                mod.enabled = False
+                if mod.missing:
+                    # Only modlist.txt kept it in the list
+                    changes.removed.add(mod.name)
+                    continue
+                disabled.append(mod)
+            
+            self._mods = enabled + disabled
+        
+        self._reindex()
+        for name in changes.removed:
+            if name not in self._index:
+                self.requirement_graph.discard(name)
+        changes.reordered = self.enabled_mod_names != old_enabled
+        
+        if not changes.is_empty:
+            self._notify_observers(changes)
+        return changes
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+from typing import Set
+
+
+@dataclass
+class ModListChanges:
+    """
+    What a ModList mutation (or a batch of them) changed.
+    
+    reordered is set whenever the enabled order changed. If every such
+    change moved individual mods past others, moved names them; if the
+    order was rearranged wholesale, moved is empty.
+    """
+    
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    updated: Set[str] = field(default_factory=set)
+    enabled: Set[str] = field(default_factory=set)
+    disabled: Set[str] = field(default_factory=set)
+    moved: Set[str] = field(default_factory=set)
+    reordered: bool = False
+    from_disk: bool = False
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.updated or self.enabled or self.disabled or self.reordered)
+    
+    def merge(self, other: "ModListChanges"):
+        for name in other.added:
+            if name in self.removed:
+                self.removed.discard(name)
+                self.updated.add(name)
+            else:
+                self.added.add(name)
+        for name in other.removed:
+            if name in self.added:
+                self.added.discard(name)
+            else:
+                self.removed.add(name)
+            self.updated.discard(name)
+        self.updated |= other.updated - self.added - self.removed
+        
+        # Enabling and then disabling a mod again cancels out
+        for name in other.enabled:
+            if name in self.disabled:
+                self.disabled.discard(name)
+            else:
+                self.enabled.add(name)
+        for name in other.disabled:
+            if name in self.enabled:
+                self.enabled.discard(name)
+            else:
+                self.disabled.add(name)
+        
+        if other.reordered:
+            if self.reordered and not self.moved:
+                pass
+            elif not other.moved:
+                self.moved = set()
+            else:
+                self.moved |= other.moved
+        self.reordered = self.reordered or other.reordered
+        # Only changes that all came from disk can skip writing modlist.txt
+        self.from_disk = self.from_disk and other.from_disk
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ModLoadError:
+    name: str
+    path: str
+    message: str
+    
+    def __str__(self) -> str:
+        return f"{self.name}: {self.message}"
@@ -0,0 +1,39 @@
+from typing import Any, NamedTuple, Optional
+from app.utils.version_parser import parse_requirement
+
+
+class ModRequirement(NamedTuple):
+    text: str
+    mod_name: Optional[str]
+    operator: str
+    version: str
+    
+    @property
+    def is_valid(self) -> bool:
+        return self.mod_name is not None
+    
+    @classmethod
+    def from_item(cls, item: Any) -> Optional["ModRequirement"]:
+        """
+        Parse one entry of a mod's requirements list.
+        
+        Entries are either strings like 'modname>=1.0' or dicts with a 'mod'
+        key and an optional 'version' key holding the operator and version.
+        
+        Returns:
+            The parsed requirement (with mod_name None if the text is not a
+            valid requirement), or None for entries of any other type.
+        """
+        if isinstance(item, dict):
+            text = str(item.get("mod", ""))
+            if "version" in item:
+                text += str(item["version"])
+        elif isinstance(item, str):
+            text = item
+        else:
+            return None
+        
+        parsed = parse_requirement(text)
+        if not parsed:
+            return cls(text, None, "", "")
+        return cls(text, *parsed)
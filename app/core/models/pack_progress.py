@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class PackProgress:
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    elapsed: float
+    
+    @property
+    def fraction(self) -> float:
+        if self.bytes_total:
+            return self.bytes_done / self.bytes_total
+        if self.files_total:
+            return self.files_done / self.files_total
+        return 1.0
+    
+    @property
+    def bytes_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.bytes_done / self.elapsed
+    
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_per_second / (1024 * 1024)
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.bytes_per_second
+        if rate <= 0:
+            return None
+        return (self.bytes_total - self.bytes_done) / rate
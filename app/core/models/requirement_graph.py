@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from app.core.models.mod import Mod
+from app.core.models.mod_requirement import ModRequirement
+from app.utils.version_parser import parse_version, compare_parsed_versions, operator_satisfied
+
+
+class RequirementEdge(NamedTuple):
+    requirement: ModRequirement
+    version_parts: Optional[Tuple[int, ...]]
+    
+    @property
+    def mod_name(self) -> Optional[str]:
+        return self.requirement.mod_name
+    
+    @property
+    def has_constraint(self) -> bool:
+        return bool(self.requirement.operator and self.requirement.version)
+
+
+class RequirementNode(NamedTuple):
+    name: str
+    version: Any
+    version_parts: Optional[Tuple[int, ...]]
+    edges: Tuple[RequirementEdge, ...]
+    # The requirements tuple the node was built from, to spot metadata changes
+    source: Tuple[ModRequirement, ...]
+    
+    @property
+    def dependencies(self) -> List[str]:
+        return [edge.mod_name for edge in self.edges if edge.mod_name is not None]
+
+
+class RequirementGraph:
+    """
+    Parsed requirements of the mods in a list, with version tuples.
+    
+    Nodes are built the first time a mod is looked up and rebuilt only
+    when that mod's metadata (and so its requirements or version) has
+    changed, so repeated validation and sorting never re-parse requirement
+    strings or versions. Mods that are never looked up, such as disabled
+    mods whose metadata has not been loaded, are not read at all.
+    """
+    
+    def __init__(self):
+        self._nodes: Dict[str, RequirementNode] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+    
+    def node(self, mod: Mod) -> RequirementNode:
+        node = self._nodes.get(mod.name)
+        requirements = mod.parsed_requirements
+        if node is not None and node.source is requirements and node.version == mod.version:
+            return node
+        
+        if node is not None:
+            self._unlink(node)
+        
+        edges = tuple(
+            RequirementEdge(req, parse_version(req.version) if req.is_valid else None)
+            for req in requirements
+        )
+        node = RequirementNode(mod.name, mod.version, parse_version(mod.version), edges, requirements)
+        self._nodes[mod.name] = node
+        for dependency in node.dependencies:
+            self._dependents.setdefault(dependency, set()).add(mod.name)
+        return node
+    
+    def _unlink(self, node: RequirementNode):
+        for dependency in node.dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(node.name)
+                if not dependents:
+                    del self._dependents[dependency]
+    
+    def discard(self, name: str):
+        node = self._nodes.pop(name, None)
+        if node is not None:
+            self._unlink(node)
+    
+    def clear(self):
+        self._nodes.clear()
+        self._dependents.clear()
+    
+    def dependents(self, name: str) -> Set[str]:
+        """Names of the looked-up mods that require the given mod."""
+        return set(self._dependents.get(name, ()))
+    
+    @staticmethod
+    def satisfies(edge: RequirementEdge, node: RequirementNode) -> bool:
+        """
+        Check an edge's version constraint against the required mod's node.
+        
+        Same result as check_requirement(node.version, operator, version),
+        without parsing either version again.
+        """
+        if not edge.has_constraint:
+            return True
+        if not node.version:
+            return False
+        return operator_satisfied(edge.requirement.operator, compare_parsed_versions(node.version_parts, edge.version_parts))
@@ -1,60 +1,221 @@
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from app.core.models.dependency_resolution import DependencyResolution
 from app.core.models.mod import Mod
+from app.core.models.mod_folder_changes import ModFolderChanges
+from app.core.models.mod_load_error import ModLoadError
 from app.core.models.mod_list import ModList
+from app.core.models.mod_list_changes import ModListChanges
+from app.core.models.requirement_graph import RequirementGraph, RequirementNode
 from app.infrastructure.mod_repository import ModRepository
-from app.utils.version_parser import parse_requirement, check_requirement
+from app.utils.logging_utils import get_logger
+from app.utils.topo_sort import topological_sort
+
+METADATA_WORKERS = 8
 
 
 class ModService:
     def __init__(self, repository: ModRepository):
         self.repository = repository
     
-    def load_mods(self) -> ModList:
+    def load_mods(self, lazy: bool = False) -> ModList:
+        """
+        Load the mod list from modlist.txt and the mod folder.
+        
+        With lazy, the mod folder is only scanned for names. Enabled mods are
+        still read up front, since validation needs their requirements right
+        away, but disabled mods read their description and preview the first
+        time one of their metadata properties is accessed.
+        """
         enabled_names = self.repository.load_enabled_mod_names()
         enabled_set = set(enabled_names)
-        folder_mods = self.repository.get_mod_folders()
+        snapshot = self.repository.scan(include_contents=not lazy)
+        
+        # (name, enabled, entry, exists) in final list order: modlist.txt first, then the rest by name
+        plan = []
+        for name in enabled_names:
+            entry = snapshot.get(name)
+            # Names that differ only in case still resolve on case-insensitive filesystems
+            exists = entry is not None or self.repository.mod_exists(name)
+            plan.append((name, True, entry, exists))
+        for name in snapshot.mod_names:
+            if name not in enabled_set:
+                plan.append((name, False, snapshot.get(name), True))
+        
+        def read(item):
+            name, enabled, entry, exists = item
+            if not exists:
+                return {}, None, None
+            if lazy:
+                # Name-only entries carry no file stats to validate the cache with
+                return self.repository.read_mod_metadata(name) if enabled else None
+            return self.repository.read_mod_metadata(name, entry)
+        
+        # JSON reads are I/O bound; map() keeps results in plan order
+        with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as executor:
+            results = list(executor.map(read, plan))
         
         mods = []
+        errors = []
         
-        for name in enabled_names:
+        for (name, enabled, _, exists), result in zip(plan, results):
             mod_path = self.repository.get_mod_path(name)
-            exists = self.repository.mod_exists(name)
             
-            if exists:
-                metadata, preview = self.repository.load_mod_metadata(name)
-            else:
-                metadata, preview = {}, None
+            if result is None:
+                mods.append(Mod(
+                    name=name,
+                    path=mod_path,
+                    enabled=enabled,
+                    loader=self._metadata_loader(name, mod_path, errors),
+                    description_loader=self._description_loader(name),
+                ))
+                continue
+            
+            metadata, preview, error = result
+            if error:
+                errors.append(ModLoadError(name=name, path=mod_path, message=error))
             
+            # The loaders fetch the metadata and the description again on demand
             mods.append(Mod(
                 name=name,
                 path=mod_path,
-                enabled=True,
+                enabled=enabled,
                 missing=not exists,
                 metadata=metadata,
                 preview_path=preview,
+                loader=self._metadata_loader(name, mod_path, errors, reported=True),
+                description_loader=self._description_loader(name),
             ))
         
-        for name in folder_mods:
-            if name in enabled_set:
+        if errors:
+            logger = get_logger()
+            for error in errors:
+                logger.warning("Failed to load mod metadata: %s", error)
+        
+        self.repository.save_metadata_cache([mod.name for mod in mods if not mod.missing])
+        
+        return ModList(mods, load_errors=errors)
+    
+    def _metadata_loader(self, name: str, mod_path: str, errors: List[ModLoadError], reported: bool = False):
+        def load():
+            nonlocal reported
+            metadata, preview, error = self.repository.read_mod_metadata(name)
+            if error and not reported:
+                reported = True
+                load_error = ModLoadError(name=name, path=mod_path, message=error)
+                errors.append(load_error)
+                get_logger().warning("Failed to load mod metadata: %s", load_error)
+            return metadata, preview
+        return load
+    
+    def _description_loader(self, name: str):
+        def load():
+            return self.repository.load_mod_description(name)
+        return load
+    
+    def reconcile(self, mod_list: ModList, changes: ModFolderChanges) -> ModListChanges:
+        """
+        Patch a loaded mod list in place for changes reported by the mod folder watcher.
+        
+        Only the mods named in changes are re-read from disk, so the cost
+        follows the size of the change rather than the size of the library.
+        Observers are notified once with the resulting change set.
+        
+        Returns:
+            The changes applied to the mod list.
+        """
+        enabled_names = self.repository.load_enabled_mod_names() if changes.modlist_changed else None
+        enabled_set = set(enabled_names) if enabled_names is not None else set()
+        
+        added = []
+        removed = {name for name in changes.removed if not self.repository.mod_exists(name)}
+        refresh = []
+        updated = []
+        
+        for name in sorted(changes.added | changes.modified):
+            if name in removed:
                 continue
-            
-            mod_path = self.repository.get_mod_path(name)
-            metadata, preview = self.repository.load_mod_metadata(name)
-            
-            mods.append(Mod(
-                name=name,
-                path=mod_path,
-                enabled=False,
-                missing=False,
-                metadata=metadata,
-                preview_path=preview,
-            ))
+            mod = mod_list.get_mod_by_name(name)
+            if mod is None:
+                mod = self._new_mod(mod_list, name, enabled=name in enabled_set)
+                added.append(mod)
+            elif mod.missing:
+                mod.missing = False
+            elif not mod.is_loaded:
+                # Its loader will read the new files when first needed
+                updated.append(name)
+                continue
+            refresh.append(mod)
+        
+        if enabled_names is not None:
+            known = {mod.name for mod in added}
+            for name in dict.fromkeys(enabled_names):
+                if name in known or mod_list.get_mod_by_name(name) is not None:
+                    continue
+                # Listed in modlist.txt but not in the list yet
+                exists = self.repository.mod_exists(name)
+                mod = self._new_mod(mod_list, name, enabled=True, missing=not exists)
+                added.append(mod)
+                if exists:
+                    refresh.append(mod)
+        
+        def read(mod):
+            return self.repository.read_mod_metadata(mod.name)
+        
+        with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as executor:
+            results = list(executor.map(read, refresh))
+        
+        stale = removed | {mod.name for mod in refresh}
+        errors = [error for error in mod_list.load_errors if error.name not in stale]
+        new_errors = []
+        for mod, (metadata, preview, error) in zip(refresh, results):
+            mod.apply_metadata(metadata)
+            mod.preview_path = preview
+            if error:
+                new_errors.append(ModLoadError(name=mod.name, path=mod.path, message=error))
         
-        return ModList(mods)
+        if new_errors:
+            logger = get_logger()
+            for error in new_errors:
+                logger.warning("Failed to load mod metadata: %s", error)
+        # Updated in place; lazily loaded mods append to the same list
+        mod_list.load_errors[:] = errors + new_errors
+        
+        known_added = {mod.name for mod in added}
+        result = mod_list.patch(
+            added=added,
+            removed=removed,
+            updated=updated + [mod.name for mod in refresh if mod.name not in known_added],
+            enabled_names=enabled_names,
+        )
+        
+        if refresh or result.removed:
+            self.repository.save_metadata_cache([mod.name for mod in mod_list.all_mods if not mod.missing])
+        
+        return result
+    
+    def _new_mod(self, mod_list: ModList, name: str, enabled: bool, missing: bool = False) -> Mod:
+        mod_path = self.repository.get_mod_path(name)
+        # reconcile() reads and reports the metadata itself
+        loader = self._metadata_loader(name, mod_path, mod_list.load_errors, reported=True)
+        return Mod(
+            name=name,
+            path=mod_path,
+            enabled=enabled,
+            missing=missing,
+            loader=loader,
+            description_loader=self._description_loader(name),
+        )
     
     def save_mod_order(self, mod_list: ModList):
         enabled_names = mod_list.enabled_mod_names
         self.repository.save_enabled_mod_names(enabled_names)
+        # Also keep metadata read lazily since startup
+        self.repository.save_metadata_cache()
+    
+    def flush_mod_order(self):
+        """Write a debounced mod order save to disk now."""
+        self.repository.flush()
     
     def get_enabled_mod_paths(self, mod_list: ModList) -> List[str]:
         return [mod.path for mod in mod_list.enabled_mods]
@@ -66,57 +227,212 @@ class ModService:
         """
         Validate mod requirements and mark mods with unmet requirements.
         
+        The errors are also kept per mod in mod_list.requirement_errors, for
+        revalidate_requirements to update.
+        
         Returns:
             List of error messages for mods with unmet requirements.
         """
         errors = []
         enabled_mods = mod_list.enabled_mods
+        graph = mod_list.requirement_graph
         
-        mod_positions = {mod.name: idx for idx, mod in enumerate(enabled_mods)}
-        mod_versions = {mod.name: mod.version for mod in enabled_mods}
-        
+        located = {}
         for idx, mod in enumerate(enabled_mods):
-            mod.has_unmet_requirements = False
+            located[mod.name] = (idx, graph.node(mod))
+        
+        mod_list.requirement_errors = {}
+        for mod in enabled_mods:
+            mod_errors = self._check_requirements(mod, located[mod.name], located.get, graph)
+            mod.has_unmet_requirements = bool(mod_errors)
+            if mod_errors:
+                mod_list.requirement_errors[mod.name] = mod_errors
+                errors.extend(mod_errors)
+        
+        return errors
+    
+    def revalidate_requirements(self, mod_list: ModList, changes: Optional[ModListChanges]) -> Set[str]:
+        """
+        Update requirement flags after an edit, re-checking only what it affects.
+        
+        Moving, enabling or disabling a mod can only change the result for
+        that mod and for the mods that require it, which the requirement
+        graph indexes, so an edit costs O(degree) instead of a full pass.
+        Mods added, removed or updated on disk and wholesale reorders fall
+        back to validate_requirements.
+        
+        Returns:
+            Names of the mods whose has_unmet_requirements flag changed.
+        """
+        if changes is None or changes.added or changes.removed or changes.updated or (changes.reordered and not changes.moved):
+            before = [(mod, mod.has_unmet_requirements) for mod in mod_list.all_mods]
+            self.validate_requirements(mod_list)
+            return {mod.name for mod, flag in before if mod.has_unmet_requirements != flag}
+        
+        graph = mod_list.requirement_graph
+        
+        def locate(name: str) -> Optional[Tuple[int, RequirementNode]]:
+            position = mod_list.load_position(name)
+            if position is None:
+                return None
+            return position, graph.node(mod_list.get_mod_by_name(name))
+        
+        affected = set()
+        for name in changes.moved | changes.enabled | changes.disabled:
+            affected.add(name)
+            affected |= graph.dependents(name)
+        
+        flipped = set()
+        for name in affected:
+            location = locate(name)
+            if location is None:
+                # Disabled mods keep their flag, as with a full validation
+                mod_list.requirement_errors.pop(name, None)
+                continue
+            
+            mod = mod_list.get_mod_by_name(name)
+            mod_errors = self._check_requirements(mod, location, locate, graph)
+            if mod_errors:
+                mod_list.requirement_errors[name] = mod_errors
+            else:
+                mod_list.requirement_errors.pop(name, None)
+            if mod.has_unmet_requirements != bool(mod_errors):
+                mod.has_unmet_requirements = bool(mod_errors)
+                flipped.add(name)
+        
+        return flipped
+    
+    def get_requirement_errors(self, mod_list: ModList) -> List[str]:
+        """Error messages of the last validation, in load order."""
+        errors = []
+        for name in mod_list.enabled_mod_names:
+            errors.extend(mod_list.requirement_errors.get(name, ()))
+        return errors
+    
+    def _check_requirements(
+        self,
+        mod: Mod,
+        location: Tuple[int, RequirementNode],
+        locate: Callable[[str], Optional[Tuple[int, RequirementNode]]],
+        graph: RequirementGraph
+    ) -> List[str]:
+        # location is the mod's own (load position, node); locate finds the
+        # same for an enabled mod by name, or None if it is not enabled
+        errors = []
+        idx, node = location
+        
+        for edge in node.edges:
+            req = edge.requirement
+            if not req.is_valid:
+                errors.append(f"{mod.name}: Invalid requirement format '{req.text}'")
+                continue
+            
+            req_mod_name, operator, req_version = req.mod_name, req.operator, req.version
             
-            if not mod.requirements:
+            required_location = locate(req_mod_name)
+            if required_location is None:
+                errors.append(f"{mod.name}: Required mod '{req_mod_name}' is not enabled")
                 continue
             
-            for req_item in mod.requirements:
-                if isinstance(req_item, dict):
-                    req_string = req_item.get('mod', '')
-                    if 'version' in req_item:
-                        req_string += req_item['version']
-                elif isinstance(req_item, str):
-                    req_string = req_item
-                else:
-                    continue
-                
-                parsed = parse_requirement(req_string)
-                if not parsed:
-                    errors.append(f"{mod.name}: Invalid requirement format '{req_string}'")
-                    mod.has_unmet_requirements = True
+            req_position, required = required_location
+            if req_position > idx:
+                errors.append(f"{mod.name}: Required mod '{req_mod_name}' must be loaded before this mod (move it up in the list)")
+                continue
+            
+            if not graph.satisfies(edge, required):
+                errors.append(f"{mod.name}: Required mod '{req_mod_name}' version {required.version} does not satisfy {operator}{req_version}")
+        
+        return errors
+    
+    def resolve_requirements(self, mod_list: ModList, wanted: Iterable[str]) -> DependencyResolution:
+        """
+        Work out which mods to enable so that the wanted mods' requirements are met.
+        
+        Requirements are followed transitively across all installed mods,
+        visiting each mod once, and version constraints are checked as
+        check_requirement does. Enabled mods keep their order where their
+        requirements allow; each mod to enable goes just before the first
+        enabled mod that needs it, or at the bottom.
+        
+        Args:
+            mod_list: The mod list
+            wanted: Names of the mods the user wants enabled
+            
+        Returns:
+            The mods to enable and the resulting order, with an explanation
+            for each requirement that cannot be met.
+        """
+        graph = mod_list.requirement_graph
+        resolution = DependencyResolution()
+        conflicts = resolution.conflicts
+        
+        closure: Dict[str, RequirementNode] = {}
+        stack = []
+        for name in dict.fromkeys(wanted):
+            mod = mod_list.get_mod_by_name(name)
+            if mod is None or mod.missing:
+                conflicts.append(f"{name}: Mod is not installed")
+            else:
+                stack.append(mod)
+        
+        while stack:
+            mod = stack.pop()
+            if mod.name in closure:
+                continue
+            node = closure[mod.name] = graph.node(mod)
+            
+            for edge in node.edges:
+                req = edge.requirement
+                if not req.is_valid:
+                    conflicts.append(f"{mod.name}: Invalid requirement format '{req.text}'")
                     continue
                 
-                req_mod_name, operator, req_version = parsed
-                
-                if req_mod_name not in mod_positions:
-                    errors.append(f"{mod.name}: Required mod '{req_mod_name}' is not enabled")
-                    mod.has_unmet_requirements = True
+                required_mod = mod_list.get_mod_by_name(req.mod_name)
+                if required_mod is None or required_mod.missing:
+                    conflicts.append(f"{mod.name}: Required mod '{req.mod_name}' is not installed")
                     continue
                 
-                req_position = mod_positions[req_mod_name]
-                if req_position > idx:
-                    errors.append(f"{mod.name}: Required mod '{req_mod_name}' must be loaded before this mod (move it up in the list)")
-                    mod.has_unmet_requirements = True
+                required = graph.node(required_mod)
+                if not graph.satisfies(edge, required):
+                    conflicts.append(f"{mod.name}: Required mod '{req.mod_name}' version {required.version} does not satisfy {req.operator}{req.version}")
+                if required_mod.name not in closure:
+                    stack.append(required_mod)
+        
+        current = mod_list.enabled_mod_names
+        positions = {name: i for i, name in enumerate(current)}
+        resolution.to_enable = [name for name in closure if name not in positions]
+        new = set(resolution.to_enable)
+        
+        dependencies = {}
+        for name in current:
+            dependencies[name] = graph.node(mod_list.get_mod_by_name(name)).dependencies
+        for name in resolution.to_enable:
+            dependencies[name] = closure[name].dependencies
+        
+        # Anchor each new mod to the earliest enabled mod that needs it
+        anchors: Dict[str, int] = {}
+        for name in current:
+            pending = [dep for dep in dependencies[name] if dep in new]
+            while pending:
+                dep = pending.pop()
+                if dep in anchors:
                     continue
-                
-                if operator and req_version:
-                    req_mod_version = mod_versions.get(req_mod_name, '')
-                    if not check_requirement(req_mod_version, operator, req_version):
-                        errors.append(f"{mod.name}: Required mod '{req_mod_name}' version {req_mod_version} does not satisfy {operator}{req_version}")
-                        mod.has_unmet_requirements = True
+                anchors[dep] = positions[name]
+                pending.extend(d for d in dependencies[dep] if d in new)
         
-        return errors
+        def key(name: str):
+            if name in positions:
+                return positions[name], 1, ""
+            return anchors.get(name, len(current)), 0, name.lower()
+        
+        order, cycles = topological_sort(current + resolution.to_enable, dependencies, key=key)
+        resolution.order = order
+        resolution.to_enable = [name for name in order if name in new]
+        for cycle in cycles:
+            if any(name in closure for name in cycle):
+                conflicts.append(f"Circular dependency between {', '.join(cycle)}")
+        
+        return resolution
     
     def detect_conflicts(self, mod_list: ModList, config) -> List[str]:
         """
@@ -152,7 +468,7 @@ class ModService:
     
     def auto_sort(self, mod_list: ModList) -> Tuple[List[str], List[str]]:
         """
-        Sort enabled mods alphabetically, then adjust to satisfy requirements.
+        Sort enabled mods so required mods load first, alphabetically where requirements allow.
         
         Returns:
             Tuple of (sorted_names, warnings) where warnings contains messages about issues.
@@ -163,51 +479,13 @@ class ModService:
         if not enabled_mods:
             return [], []
         
-        sorted_mods = sorted(enabled_mods, key=lambda m: m.name.lower())
-        
-        dependencies = {}  
-        for mod in sorted_mods:
-            deps = []
-            for req_item in mod.requirements:
-                if isinstance(req_item, dict):
-                    req_string = req_item.get('mod', '')
-                elif isinstance(req_item, str):
-                    req_string = req_item
-                else:
-                    continue
-                
-                parsed = parse_requirement(req_string)
-                if parsed:
-                    req_mod_name, _, _ = parsed
-                    deps.append(req_mod_name)
-            dependencies[mod.name] = deps
-        
-        mod_names = [m.name for m in sorted_mods]
-        changed = True
-        iterations = 0
-        max_iterations = len(mod_names) * len(mod_names)  
-        
-        while changed and iterations < max_iterations:
-            changed = False
-            iterations += 1
-            
-            for i, mod_name in enumerate(mod_names):
-                if mod_name not in dependencies:
-                    continue
-                
-                for dep_name in dependencies[mod_name]:
-                    if dep_name not in mod_names:
-                        continue 
-                    
-                    dep_idx = mod_names.index(dep_name)
-                    if dep_idx > i:
-                        mod_names.pop(dep_idx)
-                        mod_names.insert(i, dep_name)
-                        changed = True
-                        break
-        
-        if iterations >= max_iterations:
-            warnings.append("Circular dependencies detected. Some requirements may not be satisfied.")
+        graph = mod_list.requirement_graph
+        dependencies = {mod.name: graph.node(mod).dependencies for mod in enabled_mods}
+        
+        mod_names, cycles = topological_sort(dependencies.keys(), dependencies)
+        
+        for cycle in cycles:
+            warnings.append(f"Circular dependency between {', '.join(cycle)}. Some requirements may not be satisfied.")
         
         return mod_names, warnings
 
@@ -1,40 +1,273 @@
+import json
 import os
-import struct
-from pathlib import Path
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from app.core.models.archive_diff import ArchiveDiff
+from app.core.models.pack_progress import PackProgress
+from app.infrastructure.gpak_archive import HASH_ALGORITHM, GpakArchive, GpakEntry, copy_payload, encode_header
+from app.infrastructure.gpak_filesystem import GpakFileSystem
+from app.utils.logging_utils import get_logger
+
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+MANIFEST_NAME = ".mewtator_manifest.json"
+OVERLAY_SIGNATURE_SUFFIX = ".overlay.json"
+MOD_METADATA_FILES = ("description.json", "info.json", "modinfo.json")
+
+
+class SourceFile(NamedTuple):
+    rel: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+class ProgressTracker:
+    """Turns per-entry completions into PackProgress reports and a throughput log line."""
+    
+    def __init__(self, callback, files_total: int, bytes_total: int):
+        self.callback = callback
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_done = 0
+        self.bytes_done = 0
+        self.started = time.monotonic()
+    
+    def snapshot(self) -> PackProgress:
+        return PackProgress(
+            files_done=self.files_done,
+            files_total=self.files_total,
+            bytes_done=self.bytes_done,
+            bytes_total=self.bytes_total,
+            elapsed=time.monotonic() - self.started,
+        )
+    
+    def advance(self, size: int):
+        self.files_done += 1
+        self.bytes_done += size
+        if self.callback:
+            self.callback(self.snapshot())
+    
+    def skip_all(self):
+        self.files_done = self.files_total
+        self.bytes_done = self.bytes_total
+        if self.callback:
+            self.callback(self.snapshot())
+    
+    def finish(self, operation: str):
+        progress = self.snapshot()
+        get_logger().info(
+            "%s: %d files, %.1f MB in %.2fs (%.1f MB/s)",
+            operation,
+            progress.files_done,
+            progress.bytes_done / (1024 * 1024),
+            progress.elapsed,
+            progress.megabytes_per_second,
+        )
+
+
+class PackCancelled(Exception):
+    pass
 
 
 class PackService:
-    def unpack(self, game_dir: str, output_dir: str, progress_callback=None):
+    def unpack(
+        self,
+        game_dir: str,
+        output_dir: str,
+        progress_callback=None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Extract resources.gpak into output_dir.
+        
+        Args:
+            game_dir: Game installation directory containing resources.gpak
+            output_dir: Folder to extract into
+            progress_callback: Called with a PackProgress after each entry
+            include: Glob patterns of entries to extract (all if empty)
+            exclude: Glob patterns of entries to skip
+            workers: Number of writer threads (defaults to DEFAULT_WORKERS, 1 disables threading)
+            cancel_event: When set, extraction stops, the files this run
+                created are removed and PackCancelled is raised
+        """
         gpak_path = Path(game_dir) / "resources.gpak"
         out_dir = Path(output_dir)
         
         if not gpak_path.exists():
             raise FileNotFoundError(f"resources.gpak not found in: {game_dir}")
         
+        if workers is None:
+            workers = DEFAULT_WORKERS
+        
         out_dir.mkdir(parents=True, exist_ok=True)
         
-        with gpak_path.open("rb") as f:
-            count = struct.unpack("<i", f.read(4))[0]
+        with GpakArchive(str(gpak_path)) as archive:
+            entries = archive.list_entries(include, exclude)
+            tracker = ProgressTracker(progress_callback, len(entries), sum(entry.size for entry in entries))
             
-            entries = []
-            for _ in range(count):
-                path_len = struct.unpack("<h", f.read(2))[0]
-                path = f.read(path_len).decode("utf-8")
-                file_len = struct.unpack("<i", f.read(4))[0]
-                entries.append((path, file_len))
+            by_parent: Dict[Path, List[GpakEntry]] = {}
+            for entry in entries:
+                by_parent.setdefault((out_dir / entry.path).parent, []).append(entry)
             
-            for i, (path, file_len) in enumerate(entries):
-                out_path = out_dir / path
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                data = f.read(file_len)
-                with out_path.open("wb") as out:
-                    out.write(data)
-                
-                if progress_callback:
-                    progress_callback(i + 1, count)
+            # Build the directory tree once instead of per entry. Files already
+            # there before this run are never removed on cancel; each directory
+            # that existed is listed once to find them.
+            created_dirs = []
+            preexisting = set()
+            for parent in sorted(by_parent):
+                if not parent.exists():
+                    parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.append(parent)
+                    continue
+                try:
+                    with os.scandir(parent) as it:
+                        names = {dir_entry.name for dir_entry in it}
+                except OSError:
+                    continue
+                preexisting.update(entry.path for entry in by_parent[parent] if PurePosixPath(entry.path).name in names)
+            
+            extracted = {}
+            
+            try:
+                if workers <= 1:
+                    for entry in entries:
+                        self._check_cancelled(cancel_event)
+                        extracted[entry.path] = self._extract_entry(archive, entry, out_dir)
+                        tracker.advance(entry.size)
+                else:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = {
+                            executor.submit(self._extract_entry, archive, entry, out_dir, cancel_event): entry
+                            for entry in entries
+                        }
+                        try:
+                            for future in as_completed(futures):
+                                stat = future.result()
+                                if stat is not None:
+                                    extracted[futures[future].path] = stat
+                                self._check_cancelled(cancel_event)
+                                tracker.advance(futures[future].size)
+                        except BaseException:
+                            for future in futures:
+                                future.cancel()
+                            raise
+                        finally:
+                            # Writes still running when we bailed out count as written
+                            executor.shutdown(wait=True)
+                            for future, entry in futures.items():
+                                if future.done() and not future.cancelled() and future.exception() is None and future.result() is not None:
+                                    extracted.setdefault(entry.path, future.result())
+            except BaseException:
+                created = [rel for rel in extracted if rel not in preexisting]
+                self._remove_partial_output(out_dir, created, created_dirs)
+                raise
+        
+        tracker.finish("Unpack")
+        
+        # Remember what was extracted so the next repack can reuse unchanged payloads
+        archive_stat = gpak_path.stat()
+        manifest = self._load_manifest(out_dir, gpak_path)
+        manifest.update(extracted)
+        self._save_manifest(out_dir, archive_stat, manifest)
+    
+    def _extract_entry(self, archive: GpakArchive, entry: GpakEntry, out_dir: Path, cancel_event: Optional[threading.Event] = None) -> Optional[Tuple[int, int]]:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        out_path = out_dir / entry.path
+        archive.write_entry(entry, out_path)
+        st = out_path.stat()
+        return st.st_size, st.st_mtime_ns
+    
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]):
+        if cancel_event is not None and cancel_event.is_set():
+            raise PackCancelled()
+    
+    @staticmethod
+    def _remove_partial_output(out_dir: Path, created_files: List[str], created_dirs: List[Path]):
+        for rel in created_files:
+            try:
+                (out_dir / rel).unlink()
+            except OSError:
+                pass
+        
+        # Deepest first so parents are empty by the time we reach them
+        for directory in sorted(created_dirs, key=lambda d: len(d.parts), reverse=True):
+            while directory != out_dir:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+    
+    def list_entries(self, game_dir: str, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> List[GpakEntry]:
+        gpak_path = Path(game_dir) / "resources.gpak"
+        
+        if not gpak_path.exists():
+            raise FileNotFoundError(f"resources.gpak not found in: {game_dir}")
+        
+        with GpakArchive(str(gpak_path)) as archive:
+            return archive.list_entries(include, exclude)
+    
+    def open_filesystem(self, game_dir: str) -> GpakFileSystem:
+        """
+        Open resources.gpak as a read-only virtual filesystem.
+        
+        The caller owns the returned object and should close it (or use it
+        as a context manager). Call mount() on it to expose it through FUSE.
+        """
+        gpak_path = Path(game_dir) / "resources.gpak"
+        
+        if not gpak_path.exists():
+            raise FileNotFoundError(f"resources.gpak not found in: {game_dir}")
+        
+        archive = GpakArchive(str(gpak_path))
+        archive.open()
+        return GpakFileSystem(archive)
+    
+    def extract_file(self, game_dir: str, entry_path: str) -> bytes:
+        gpak_path = Path(game_dir) / "resources.gpak"
+        
+        if not gpak_path.exists():
+            raise FileNotFoundError(f"resources.gpak not found in: {game_dir}")
+        
+        with GpakArchive(str(gpak_path)) as archive:
+            return archive.read(entry_path)
     
-    def repack(self, source_dir: str, output_gpak: str, progress_callback=None):
+    def repack(
+        self,
+        source_dir: str,
+        output_gpak: str,
+        progress_callback=None,
+        incremental: bool = True,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        """
+        Build a gpak from a source tree.
+        
+        With incremental set, files whose size and mtime still match the
+        manifest written by the last unpack/repack are copied by byte range
+        from the existing output archive instead of being re-read from the
+        loose files, and an archive that is already up to date is left alone.
+        
+        Paths the existing output archive already contains keep its entry
+        order; new files are appended after them in path order.
+        
+        Args:
+            source_dir: Folder to pack (normally <mod_folder>/_unpacked)
+            output_gpak: Archive to write
+            progress_callback: Called with a PackProgress after each entry
+            incremental: Reuse unchanged payloads from the existing output_gpak
+            cancel_event: When set, packing stops, the partial archive is
+                discarded and PackCancelled is raised
+        """
         source_root = Path(source_dir)
         output_gpak_path = Path(output_gpak)
         
@@ -43,21 +276,366 @@ class PackService:
         
         output_gpak_path.parent.mkdir(parents=True, exist_ok=True)
         
-        files = [p for p in source_root.rglob("*") if p.is_file()]
+        files = self._scan_source(source_root)
+        count = len(files)
+        tracker = ProgressTracker(progress_callback, count, sum(src.size for src in files))
+        
+        manifest = self._load_manifest(source_root, output_gpak_path) if incremental else {}
+        
+        if not manifest:
+            files = self._in_archive_order(files, self._archive_paths(output_gpak_path))
+            self._write_gpak(output_gpak_path, files, None, {}, tracker, cancel_event)
+        else:
+            with GpakArchive(str(output_gpak_path)) as base:
+                files = self._in_archive_order(files, base.paths)
+                reusable = {}
+                for src in files:
+                    entry = base.get_entry(src.rel)
+                    if entry is not None and manifest.get(src.rel) == (src.size, src.mtime_ns) and entry.size == src.size:
+                        reusable[src.rel] = entry
+                
+                up_to_date = (
+                    len(reusable) == count == len(base)
+                    and all(base.entry_at(i).path == src.rel for i, src in enumerate(files))
+                )
+                
+                if not up_to_date:
+                    self._write_gpak(output_gpak_path, files, base, reusable, tracker, cancel_event)
+                else:
+                    tracker.skip_all()
         
-        with output_gpak_path.open("wb") as f:
-            f.write(struct.pack("<i", len(files)))
+        tracker.finish("Repack")
+        
+        self._save_manifest(
+            source_root,
+            output_gpak_path.stat(),
+            {src.rel: (src.size, src.mtime_ns) for src in files}
+        )
+    
+    def write_patch(self, source_dir: str, base_gpak: str, patch_gpak: str, progress_callback=None) -> List[str]:
+        """
+        Write a gpak holding only the entries changed since the last unpack/repack.
+        
+        A file counts as changed when it is new, or its size or mtime differs
+        from the manifest. Deleted files cannot be expressed in a gpak and are
+        not part of the patch.
+        
+        Returns:
+            The archive paths written to the patch.
+        """
+        source_root = Path(source_dir)
+        
+        if not source_root.exists():
+            raise FileNotFoundError(f"Source folder does not exist: {source_dir}")
+        
+        manifest = self._load_manifest(source_root, Path(base_gpak))
+        changed = [
+            src for src in self._scan_source(source_root)
+            if manifest.get(src.rel) != (src.size, src.mtime_ns)
+        ]
+        
+        patch_path = Path(patch_gpak)
+        patch_path.parent.mkdir(parents=True, exist_ok=True)
+        tracker = ProgressTracker(progress_callback, len(changed), sum(src.size for src in changed))
+        self._write_gpak(patch_path, changed, None, {}, tracker)
+        tracker.finish("Patch")
+        
+        return [src.rel for src in changed]
+    
+    def build_overlay(self, game_dir: str, mod_list, output_gpak: str, config=None, progress_callback=None) -> bool:
+        """
+        Merge the files of all enabled mods over resources.gpak into one archive.
+        
+        Mods are layered in the same priority the launcher gives them: later
+        mods in the enabled list override earlier ones, or the other way round
+        when config.use_original_load_order is set. Base payloads that no mod
+        touches are copied by byte range. A signature of the base archive,
+        the load order and every mod file is cached next to the output, and
+        the archive is only rebuilt when it changes.
+        
+        Returns:
+            True if the overlay was (re)built, False if the cached one was current.
+        """
+        gpak_path = Path(game_dir) / "resources.gpak"
+        output_path = Path(output_gpak)
+        signature_path = output_path.with_name(output_path.name + OVERLAY_SIGNATURE_SUFFIX)
+        
+        if not gpak_path.exists():
+            raise FileNotFoundError(f"resources.gpak not found in: {game_dir}")
+        
+        mod_paths = [mod.path for mod in mod_list.enabled_mods]
+        layers = mod_paths if not (config and config.use_original_load_order) else list(reversed(mod_paths))
+        
+        overlay: Dict[str, SourceFile] = {}
+        for mod_path in layers:
+            for src in self._scan_source(Path(mod_path)):
+                if self._is_overlay_file(src.rel):
+                    overlay[src.rel] = src
+        
+        base_stat = gpak_path.stat()
+        signature = {
+            "base": [base_stat.st_size, base_stat.st_mtime_ns],
+            "mods": layers,
+            "files": {rel: [src.path, src.size, src.mtime_ns] for rel, src in sorted(overlay.items())},
+        }
+        
+        if output_path.exists():
+            try:
+                with open(signature_path, "r", encoding="utf-8") as f:
+                    if json.load(f) == signature:
+                        return False
+            except (OSError, ValueError):
+                pass
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with GpakArchive(str(gpak_path)) as base:
+            files = []
+            reusable = {}
+            for i in range(len(base)):
+                entry = base.entry_at(i)
+                src = overlay.pop(entry.path, None)
+                if src is None:
+                    src = SourceFile(entry.path, "", entry.size, 0)
+                    reusable[entry.path] = entry
+                files.append(src)
+            files.extend(src for _, src in sorted(overlay.items()))
+            
+            tracker = ProgressTracker(progress_callback, len(files), sum(src.size for src in files))
+            self._write_gpak(output_path, files, base, reusable, tracker)
+            tracker.finish("Overlay build")
+        
+        with open(signature_path, "w", encoding="utf-8") as f:
+            json.dump(signature, f)
+        
+        return True
+    
+    @staticmethod
+    def _is_overlay_file(rel: str) -> bool:
+        name = rel.rsplit("/", 1)[-1]
+        if name.startswith("."):
+            return False
+        if "/" in rel:
+            return True
+        lowered = name.lower()
+        if lowered in MOD_METADATA_FILES:
+            return False
+        return not (lowered.startswith("preview") and lowered.rsplit(".", 1)[-1] in ("png", "jpg", "jpeg", "webp"))
+    
+    def manifest(self, gpak_path: str, manifest_path: Optional[str] = None, workers: Optional[int] = None, progress_callback=None) -> Dict[str, Tuple[int, str]]:
+        """
+        Hash every entry of an archive.
+        
+        Args:
+            gpak_path: Archive to hash
+            manifest_path: If given, the manifest is also written there as JSON
+            workers: Number of hashing threads (defaults to DEFAULT_WORKERS)
+            progress_callback: Called with a PackProgress after each entry
             
-            for relpath in files:
-                rel = relpath.relative_to(source_root).as_posix()
-                rel_bytes = rel.encode("utf-8")
-                f.write(struct.pack("<h", len(rel_bytes)))
-                f.write(rel_bytes)
-                f.write(struct.pack("<i", relpath.stat().st_size))
+        Returns:
+            Mapping of archive path to (size, content hash).
+        """
+        if workers is None:
+            workers = DEFAULT_WORKERS
+        
+        entries = {}
+        with GpakArchive(gpak_path) as archive:
+            items = archive.list_entries()
+            tracker = ProgressTracker(progress_callback, len(items), sum(entry.size for entry in items))
             
-            for i, relpath in enumerate(files):
-                with relpath.open("rb") as src:
-                    f.write(src.read())
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                for entry, digest in zip(items, executor.map(archive.hash_entry, items)):
+                    entries[entry.path] = (entry.size, digest)
+                    tracker.advance(entry.size)
+        
+        tracker.finish("Manifest")
+        
+        if manifest_path:
+            data = {
+                "version": 1,
+                "algorithm": HASH_ALGORITHM,
+                "entries": {path: list(value) for path, value in entries.items()},
+            }
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+        
+        return entries
+    
+    def load_manifest(self, manifest_path: str) -> Dict[str, Tuple[int, str]]:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        
+        if not isinstance(data, dict) or data.get("algorithm") != HASH_ALGORITHM:
+            raise ValueError(f"Unsupported manifest format: {manifest_path}")
+        
+        return {path: tuple(value) for path, value in data.get("entries", {}).items()}
+    
+    def verify(self, gpak_path: str, manifest_path: str, workers: Optional[int] = None, progress_callback=None) -> ArchiveDiff:
+        """
+        Compare an archive against a previously written manifest.
+        
+        Returns:
+            ArchiveDiff of entries added, removed or changed since the manifest was taken.
+        """
+        expected = self.load_manifest(manifest_path)
+        actual = self.manifest(gpak_path, workers=workers, progress_callback=progress_callback)
+        return self.compare_manifests(expected, actual)
+    
+    @staticmethod
+    def compare_manifests(old: Dict[str, Tuple[int, str]], new: Dict[str, Tuple[int, str]]) -> ArchiveDiff:
+        return ArchiveDiff(
+            added=sorted(path for path in new if path not in old),
+            removed=sorted(path for path in old if path not in new),
+            changed=sorted(path for path, value in new.items() if path in old and old[path] != value),
+        )
+    
+    def iter_diff(
+        self,
+        old_gpak: str,
+        new_gpak: str,
+        include: Optional[List[str]] = None,
+        quick: bool = False
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Stream the differences between two archives.
+        
+        Entry tables are compared first; payloads are only touched for
+        entries present in both with the same size. In quick mode a matching
+        sampled hash is taken as unchanged and the full byte comparison is
+        skipped.
+        
+        Args:
+            old_gpak: Archive from the previous game version
+            new_gpak: Archive from the new game version
+            include: Glob patterns limiting which entries are compared
+            quick: Trust size plus sampled hash instead of comparing every byte
+            
+        Yields:
+            ("added" | "removed" | "changed", path) tuples.
+        """
+        with GpakArchive(old_gpak) as old, GpakArchive(new_gpak) as new:
+            for entry in old.list_entries(include):
+                new_entry = new.get_entry(entry.path)
+                if new_entry is None:
+                    yield "removed", entry.path
+                elif entry.size != new_entry.size:
+                    yield "changed", entry.path
+                elif quick:
+                    if old.sample_hash(entry) != new.sample_hash(new_entry):
+                        yield "changed", entry.path
+                elif not old.payload_equals(entry, new, new_entry):
+                    yield "changed", entry.path
+            
+            for entry in new.list_entries(include):
+                if entry.path not in old:
+                    yield "added", entry.path
+    
+    def diff(self, old_gpak: str, new_gpak: str, include: Optional[List[str]] = None, quick: bool = False) -> ArchiveDiff:
+        result = ArchiveDiff()
+        for status, path in self.iter_diff(old_gpak, new_gpak, include, quick):
+            getattr(result, status).append(path)
+        return result
+    
+    def _write_gpak(self, output_path: Path, files: List[SourceFile], base: Optional[GpakArchive], reusable: Dict[str, GpakEntry], tracker: ProgressTracker, cancel_event: Optional[threading.Event] = None):
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        
+        try:
+            with tmp_path.open("wb", buffering=0) as f:
+                f.write(encode_header([(src.rel, src.size) for src in files]))
+                out_fd = f.fileno()
                 
-                if progress_callback:
-                    progress_callback(i + 1, len(files))
+                for src in files:
+                    self._check_cancelled(cancel_event)
+                    entry = reusable.get(src.rel)
+                    if entry is not None:
+                        copy_payload(base.fileno(), out_fd, entry.size, entry.offset)
+                    else:
+                        src_fd = os.open(src.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+                        try:
+                            copy_payload(src_fd, out_fd, src.size, 0)
+                        finally:
+                            os.close(src_fd)
+                    
+                    tracker.advance(src.size)
+            
+            if base is not None:
+                # Windows cannot replace a file that is still mapped
+                base.close()
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+    
+    @staticmethod
+    def _archive_paths(gpak_path: Path) -> List[str]:
+        if not gpak_path.exists():
+            return []
+        try:
+            with GpakArchive(str(gpak_path)) as archive:
+                return archive.paths
+        except (OSError, ValueError):
+            return []
+    
+    @staticmethod
+    def _in_archive_order(files: List[SourceFile], archive_paths: List[str]) -> List[SourceFile]:
+        # Files the archive has, in its order, then the rest in their given order
+        remaining = {src.rel: src for src in files}
+        ordered = [remaining.pop(rel) for rel in archive_paths if rel in remaining]
+        ordered.extend(remaining.values())
+        return ordered
+    
+    def _load_manifest(self, source_root: Path, gpak_path: Path) -> Dict[str, Tuple[int, int]]:
+        """
+        Load the (size, mtime_ns) of each file as last unpacked or packed.
+        
+        Returns an empty dict when there is no manifest or it was written for
+        a different version of the archive.
+        """
+        try:
+            with open(source_root / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            archive_stat = gpak_path.stat()
+        except (OSError, ValueError):
+            return {}
+        
+        archive = data.get("archive", {})
+        if archive.get("size") != archive_stat.st_size or archive.get("mtime_ns") != archive_stat.st_mtime_ns:
+            return {}
+        
+        return {rel: tuple(stat) for rel, stat in data.get("files", {}).items()}
+    
+    def _save_manifest(self, source_root: Path, archive_stat: os.stat_result, files: Dict[str, Tuple[int, int]]):
+        data = {
+            "version": 1,
+            "archive": {"size": archive_stat.st_size, "mtime_ns": archive_stat.st_mtime_ns},
+            "files": {rel: list(stat) for rel, stat in files.items()},
+        }
+        try:
+            with open(source_root / MANIFEST_NAME, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+    
+    def _scan_source(self, source_root: Path) -> List[SourceFile]:
+        """Walk a source tree once, collecting each file's size and mtime from a single stat."""
+        files = []
+        pending = [(str(source_root), "")]
+        
+        while pending:
+            dir_path, rel_dir = pending.pop()
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel = f"{rel_dir}{entry.name}"
+                    if not rel_dir and entry.name == MANIFEST_NAME:
+                        continue
+                    if entry.is_dir():
+                        pending.append((entry.path, rel + "/"))
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files.append(SourceFile(rel, entry.path, st.st_size, st.st_mtime_ns))
+        
+        files.sort(key=lambda src: src.rel)
+        return files
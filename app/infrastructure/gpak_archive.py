@@ -0,0 +1,389 @@
+import fnmatch
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+COPY_CHUNK_SIZE = 1024 * 1024
+HASH_ALGORITHM = "blake2b"
+HASH_DIGEST_SIZE = 16
+SAMPLE_SIZE = 64 * 1024
+
+
+class GpakEntry(NamedTuple):
+    path: str
+    offset: int
+    size: int
+
+
+def match_path(path: str, patterns: Iterable[str]) -> bool:
+    """
+    Check an archive path against glob patterns.
+    
+    Patterns ending in '/' match everything under that prefix, anything
+    else is an fnmatch-style glob (an exact path is a glob that matches
+    only itself).
+    """
+    for pattern in patterns:
+        pattern = pattern.replace("\\", "/")
+        if pattern.endswith("/"):
+            if path.startswith(pattern):
+                return True
+        elif fnmatch.fnmatchcase(path, pattern):
+            return True
+    return False
+
+
+def encode_header(items: List[Tuple[str, int]]) -> bytes:
+    """Encode a gpak header for (path, size) pairs in archive order."""
+    header = bytearray(struct.pack("<i", len(items)))
+    for path, size in items:
+        path_bytes = path.encode("utf-8")
+        header += struct.pack("<h", len(path_bytes))
+        header += path_bytes
+        header += struct.pack("<i", size)
+    return bytes(header)
+
+
+def copy_payload(src_fd: int, dst_fd: int, count: int, offset: Optional[int] = None):
+    """
+    Append count bytes from src_fd to dst_fd without holding them in memory.
+    
+    Uses the kernel copy primitives where available and falls back to a
+    fixed-size buffer otherwise, so memory use does not depend on the size
+    of the payload. If offset is None the copy starts at src_fd's current
+    position.
+    """
+    if offset is None:
+        offset = os.lseek(src_fd, 0, os.SEEK_CUR)
+    
+    remaining = count
+    
+    if hasattr(os, "copy_file_range"):
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, remaining, offset)
+                if copied == 0:
+                    break
+                offset += copied
+                remaining -= copied
+        except OSError:
+            # Cross-device copies and some filesystems are not supported
+            pass
+    
+    if remaining > 0 and hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        try:
+            while remaining > 0:
+                copied = os.sendfile(dst_fd, src_fd, offset, remaining)
+                if copied == 0:
+                    break
+                offset += copied
+                remaining -= copied
+        except OSError:
+            pass
+    
+    if remaining > 0:
+        os.lseek(src_fd, offset, os.SEEK_SET)
+        while remaining > 0:
+            chunk = os.read(src_fd, min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            while view:
+                written = os.write(dst_fd, view)
+                view = view[written:]
+            offset += len(chunk)
+            remaining -= len(chunk)
+    
+    if remaining > 0:
+        raise IOError(f"Source ended {remaining} bytes early")
+
+
+class GpakArchive:
+    """
+    Random-access reader for resources.gpak.
+
+    The archive is memory-mapped and its header is decoded once into an
+    offset/size table. The table is kept in a sidecar index next to the
+    archive, keyed by the archive's size and mtime, so reopening an
+    unchanged archive skips the header walk entirely.
+    """
+
+    INDEX_SUFFIX = ".idx"
+    _INDEX_MAGIC = b"MEWIDX01"
+    _INDEX_HEADER = struct.Struct("<8sqqq")
+
+    def __init__(self, gpak_path: str, use_index: bool = True):
+        self.path = Path(gpak_path)
+        self.index_path = self.path.with_name(self.path.name + self.INDEX_SUFFIX)
+        self.use_index = use_index
+
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._paths: List[str] = []
+        self._offsets = array("q")
+        self._sizes = array("q")
+        self._lookup: Optional[Dict[str, int]] = None
+        self.data_offset = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        if self._mmap is not None:
+            return
+
+        if not self.path.exists():
+            raise FileNotFoundError(f"Archive not found: {self.path}")
+
+        self._file = self.path.open("rb")
+        try:
+            st = os.fstat(self._file.fileno())
+            if st.st_size < 4:
+                raise ValueError(f"Archive is truncated: {self.path}")
+
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if not (self.use_index and self._load_index(st.st_size, st.st_mtime_ns)):
+                self._parse_header()
+                if self.use_index:
+                    self._save_index(st.st_size, st.st_mtime_ns)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def fileno(self) -> int:
+        if self._file is None:
+            raise ValueError("Archive is not open")
+        return self._file.fileno()
+
+    def _parse_header(self):
+        mm = self._mmap
+        size = len(mm)
+
+        count = struct.unpack_from("<i", mm, 0)[0]
+        if count < 0:
+            raise ValueError(f"Invalid entry count in archive header: {count}")
+
+        paths = []
+        sizes = array("q")
+        pos = 4
+        try:
+            for _ in range(count):
+                path_len = struct.unpack_from("<h", mm, pos)[0]
+                pos += 2
+                paths.append(mm[pos:pos + path_len].decode("utf-8"))
+                pos += path_len
+                sizes.append(struct.unpack_from("<i", mm, pos)[0])
+                pos += 4
+        except struct.error:
+            # The header runs past the end of the file
+            raise ValueError(f"Archive is truncated: {self.path}") from None
+
+        offsets = array("q")
+        offset = pos
+        for file_len in sizes:
+            offsets.append(offset)
+            offset += file_len
+
+        if offset > size:
+            raise ValueError(f"Archive is truncated: {self.path}")
+
+        self.data_offset = pos
+        self._paths = paths
+        self._offsets = offsets
+        self._sizes = sizes
+        self._lookup = None
+
+    def _load_index(self, archive_size: int, archive_mtime_ns: int) -> bool:
+        try:
+            with self.index_path.open("rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+
+        header = self._INDEX_HEADER
+        if len(data) < header.size:
+            return False
+
+        magic, size, mtime_ns, count = header.unpack_from(data, 0)
+        if magic != self._INDEX_MAGIC or size != archive_size or mtime_ns != archive_mtime_ns:
+            return False
+
+        try:
+            pos = header.size
+            table_bytes = count * 8
+            offsets = array("q")
+            offsets.frombytes(data[pos:pos + table_bytes])
+            pos += table_bytes
+            sizes = array("q")
+            sizes.frombytes(data[pos:pos + table_bytes])
+            pos += table_bytes
+            paths = data[pos:].decode("utf-8").split("\n") if count else []
+        except (ValueError, UnicodeDecodeError):
+            return False
+
+        if len(offsets) != count or len(sizes) != count or len(paths) != count:
+            return False
+
+        self.data_offset = offsets[0] if count else 4
+        self._paths = paths
+        self._offsets = offsets
+        self._sizes = sizes
+        self._lookup = None
+        return True
+
+    def _save_index(self, archive_size: int, archive_mtime_ns: int):
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                f.write(self._INDEX_HEADER.pack(
+                    self._INDEX_MAGIC, archive_size, archive_mtime_ns, len(self._paths)
+                ))
+                f.write(self._offsets.tobytes())
+                f.write(self._sizes.tobytes())
+                f.write("\n".join(self._paths).encode("utf-8"))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # The index is only an accelerator; a read-only game folder is fine.
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._get_lookup()
+
+    def _get_lookup(self) -> Dict[str, int]:
+        if self._lookup is None:
+            self._lookup = {path: i for i, path in enumerate(self._paths)}
+        return self._lookup
+
+    def _require_open(self) -> mmap.mmap:
+        if self._mmap is None:
+            raise ValueError("Archive is not open")
+        return self._mmap
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self._paths)
+
+    def entry_at(self, index: int) -> GpakEntry:
+        return GpakEntry(self._paths[index], self._offsets[index], self._sizes[index])
+
+    def get_entry(self, path: str) -> Optional[GpakEntry]:
+        index = self._get_lookup().get(path)
+        if index is None:
+            return None
+        return self.entry_at(index)
+
+    def list_entries(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> List[GpakEntry]:
+        """
+        List archive entries, optionally filtered by glob patterns.
+        
+        Args:
+            include: Patterns an entry must match (all entries if empty)
+            exclude: Patterns that remove an entry even if included
+            
+        Returns:
+            Matching entries in archive order.
+        """
+        entries = []
+        for path, offset, size in zip(self._paths, self._offsets, self._sizes):
+            if include and not match_path(path, include):
+                continue
+            if exclude and match_path(path, exclude):
+                continue
+            entries.append(GpakEntry(path, offset, size))
+        return entries
+
+    def read(self, path: str) -> bytes:
+        entry = self.get_entry(path)
+        if entry is None:
+            raise KeyError(path)
+        return self.read_entry(entry)
+
+    def read_entry(self, entry: GpakEntry) -> bytes:
+        mm = self._require_open()
+        return mm[entry.offset:entry.offset + entry.size]
+
+    def read_range(self, entry: GpakEntry, start: int, count: int) -> bytes:
+        """Read count bytes starting at start within an entry's payload."""
+        mm = self._require_open()
+        start = min(max(start, 0), entry.size)
+        end = min(start + max(count, 0), entry.size)
+        return mm[entry.offset + start:entry.offset + end]
+
+    def write_entry(self, entry: GpakEntry, out_path: Path):
+        """
+        Write an entry's payload straight from the mapping to a file.
+        
+        Safe to call from several threads at once: each call only does a
+        positional read of the shared mapping, and the write itself runs
+        without the GIL.
+        """
+        mm = self._require_open()
+        with out_path.open("wb") as out:
+            with memoryview(mm)[entry.offset:entry.offset + entry.size] as view:
+                out.write(view)
+
+    def hash_entry(self, entry: GpakEntry) -> str:
+        """
+        Hash an entry's payload straight from the mapping.
+        
+        hashlib drops the GIL while digesting, so entries can be hashed from
+        several threads at once.
+        """
+        mm = self._require_open()
+        digest = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+        with memoryview(mm)[entry.offset:entry.offset + entry.size] as view:
+            digest.update(view)
+        return digest.hexdigest()
+
+    def sample_hash(self, entry: GpakEntry) -> str:
+        """
+        Hash the start, middle and end of an entry.
+        
+        Cheap fingerprint for large payloads: equal sizes plus equal samples
+        is a strong hint the payload is unchanged, without reading all of it.
+        """
+        if entry.size <= SAMPLE_SIZE * 3:
+            return self.hash_entry(entry)
+        
+        mm = self._require_open()
+        digest = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+        middle = entry.offset + (entry.size - SAMPLE_SIZE) // 2
+        end = entry.offset + entry.size - SAMPLE_SIZE
+        for start in (entry.offset, middle, end):
+            with memoryview(mm)[start:start + SAMPLE_SIZE] as view:
+                digest.update(view)
+        return digest.hexdigest()
+
+    def payload_equals(self, entry: GpakEntry, other: "GpakArchive", other_entry: GpakEntry) -> bool:
+        if entry.size != other_entry.size:
+            return False
+        
+        mm = self._require_open()
+        other_mm = other._require_open()
+        with memoryview(mm)[entry.offset:entry.offset + entry.size] as view:
+            with memoryview(other_mm)[other_entry.offset:other_entry.offset + other_entry.size] as other_view:
+                return view == other_view
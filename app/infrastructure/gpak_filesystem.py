@@ -0,0 +1,170 @@
+import errno
+import io
+import posixpath
+import stat
+from typing import Dict, Iterator, List, Set, Tuple
+from app.infrastructure.gpak_archive import GpakArchive, GpakEntry
+
+try:
+    from fuse import FUSE, FuseOSError, Operations
+except Exception:
+    FUSE = None
+
+
+class GpakEntryReader(io.RawIOBase):
+    """Seekable read-only file object over one entry of a mapped archive."""
+
+    def __init__(self, archive: GpakArchive, entry: GpakEntry):
+        super().__init__()
+        self._archive = archive
+        self._entry = entry
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._entry.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        remaining = self._entry.size - self._pos
+        if remaining <= 0:
+            return 0
+        with memoryview(buffer) as out:
+            count = min(len(out), remaining)
+            out[:count] = self._archive.read_range(self._entry, self._pos, count)
+        self._pos += count
+        return count
+
+
+class GpakFileSystem:
+    """
+    Read-only path API over resources.gpak.
+
+    Serves entries straight from the mapped archive using the header
+    offsets, so assets can be browsed and diffed without unpacking. Paths
+    use '/' separators and are relative to the archive root ("" is the
+    root itself).
+    """
+
+    def __init__(self, archive: GpakArchive):
+        self.archive = archive
+        self._dirs: Dict[str, Set[str]] = {"": set()}
+
+        for path in archive.paths:
+            parent, name = posixpath.split(path)
+            self._add_dir(parent)
+            self._dirs[parent].add(name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    def _add_dir(self, path: str):
+        # Register path and any missing ancestors; the root always exists
+        if path in self._dirs:
+            return
+        self._dirs[path] = set()
+        parent, name = posixpath.split(path)
+        self._add_dir(parent)
+        self._dirs[parent].add(name)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return path.replace("\\", "/").strip("/")
+
+    def exists(self, path: str) -> bool:
+        return self.isdir(path) or self.isfile(path)
+
+    def isdir(self, path: str) -> bool:
+        return self._normalize(path) in self._dirs
+
+    def isfile(self, path: str) -> bool:
+        return self._normalize(path) in self.archive
+
+    def listdir(self, path: str = "") -> List[str]:
+        path = self._normalize(path)
+        if path not in self._dirs:
+            raise FileNotFoundError(path)
+        return sorted(self._dirs[path])
+
+    def walk(self, top: str = "") -> Iterator[Tuple[str, List[str], List[str]]]:
+        pending = [self._normalize(top)]
+        while pending:
+            path = pending.pop()
+            dirs, files = [], []
+            for name in sorted(self._dirs.get(path, ())):
+                child = posixpath.join(path, name) if path else name
+                (dirs if child in self._dirs else files).append(name)
+            yield path, dirs, files
+            pending.extend(posixpath.join(path, name) if path else name for name in reversed(dirs))
+
+    def getsize(self, path: str) -> int:
+        entry = self._get_entry(path)
+        return entry.size
+
+    def _get_entry(self, path: str) -> GpakEntry:
+        entry = self.archive.get_entry(self._normalize(path))
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry
+
+    def read_bytes(self, path: str) -> bytes:
+        return self.archive.read_entry(self._get_entry(path))
+
+    def open(self, path: str) -> io.BufferedReader:
+        return io.BufferedReader(GpakEntryReader(self.archive, self._get_entry(path)))
+
+    def mount(self, mountpoint: str, foreground: bool = True):
+        """
+        Expose the archive as a read-only FUSE filesystem.
+
+        Requires the optional fusepy package and a FUSE-capable OS. Blocks
+        until the filesystem is unmounted when foreground is set.
+        """
+        if FUSE is None:
+            raise RuntimeError("FUSE support requires the 'fusepy' package")
+        FUSE(_GpakFuseOperations(self), mountpoint, foreground=foreground, ro=True, nothreads=False)
+
+
+if FUSE is not None:
+    class _GpakFuseOperations(Operations):
+        def __init__(self, fs: GpakFileSystem):
+            self.fs = fs
+
+        def getattr(self, path, fh=None):
+            if self.fs.isdir(path):
+                return {"st_mode": stat.S_IFDIR | 0o555, "st_nlink": 2}
+            if self.fs.isfile(path):
+                return {"st_mode": stat.S_IFREG | 0o444, "st_nlink": 1, "st_size": self.fs.getsize(path)}
+            raise FuseOSError(errno.ENOENT)
+
+        def readdir(self, path, fh):
+            return [".", ".."] + self.fs.listdir(path)
+
+        def read(self, path, size, offset, fh):
+            entry = self.fs._get_entry(path)
+            size = max(0, min(size, entry.size - offset))
+            return self.fs.archive.read_range(entry, offset, size)
@@ -0,0 +1,248 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from typing import Dict, Optional, Tuple
+from app.core.models.mod_folder_changes import ModFolderChanges
+from app.infrastructure.mod_repository import ModRepository, DESCRIPTION_FILENAMES, PREVIEW_EXTENSIONS
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+ROOT_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+MOD_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_metadata_file(name: str) -> bool:
+    lowered = name.lower()
+    if lowered in DESCRIPTION_FILENAMES:
+        return True
+    return lowered.startswith("preview") and lowered.split(".")[-1] in PREVIEW_EXTENSIONS
+
+
+class _InotifyBackend:
+    """Kernel change notifications for the mod folder and each mod directory (Linux only)."""
+    
+    def __init__(self, repository: ModRepository):
+        self.repository = repository
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        self._root_wd = self._add_watch(repository.mod_folder, ROOT_MASK)
+        if self._root_wd < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        
+        self._mod_wds: Dict[int, str] = {}
+        for name in repository.get_mod_folders():
+            self._watch_mod(name)
+    
+    def _add_watch(self, path: str, mask: int) -> int:
+        return self._libc.inotify_add_watch(self._fd, os.fsencode(path), ctypes.c_uint32(mask))
+    
+    def _watch_mod(self, name: str):
+        wd = self._add_watch(self.repository.get_mod_path(name), MOD_MASK)
+        if wd >= 0:
+            self._mod_wds[wd] = name
+    
+    def fileno(self) -> Optional[int]:
+        return self._fd
+    
+    def read(self) -> ModFolderChanges:
+        changes = ModFolderChanges()
+        
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = os.fsdecode(data[pos:pos + name_len].rstrip(b"\0"))
+                pos += name_len
+                self._handle(changes, wd, mask, name)
+        
+        return changes
+    
+    def _handle(self, changes: ModFolderChanges, wd: int, mask: int, name: str):
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped; make the caller treat everything as changed
+            changes.modlist_changed = True
+            changes.modified.update(self._mod_wds.values())
+            return
+        
+        if wd == self._root_wd:
+            if name == os.path.basename(self.repository.modlist_path):
+                # Our own saves land here too; only report edits made by someone else
+                if self.repository.modlist_changed_externally():
+                    changes.modlist_changed = True
+            elif mask & IN_ISDIR and not name.startswith("."):
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changes.added.add(name)
+                    self._watch_mod(name)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    changes.removed.add(name)
+            return
+        
+        mod_name = self._mod_wds.get(wd)
+        if mod_name is None:
+            return
+        
+        if mask & IN_IGNORED:
+            # The directory itself is gone; the root watch reports the removal
+            del self._mod_wds[wd]
+        elif _is_metadata_file(name):
+            changes.modified.add(mod_name)
+    
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """
+    Portable fallback: two stat() calls per poll, whatever the number of mods.
+    
+    Only modlist.txt and the mod folder itself are checked. Mod directories
+    are looked at only when the mod folder's mtime moves, which is when a
+    mod is added, removed or replaced. Edits inside a mod's directory are
+    not seen in this mode; inotify reports them where it is available.
+    """
+    
+    def __init__(self, repository: ModRepository):
+        self.repository = repository
+        self._modlist_key = self._stat_key(repository.modlist_path)
+        self._root_key = self._stat_key(repository.mod_folder)
+        self._mods: Dict[str, Optional[Tuple[int, int]]] = {
+            name: self._stat_key(repository.get_mod_path(name))
+            for name in repository.get_mod_folders()
+        }
+    
+    @staticmethod
+    def _stat_key(path: Optional[str]) -> Optional[Tuple[int, int]]:
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def fileno(self) -> Optional[int]:
+        return None
+    
+    def read(self) -> ModFolderChanges:
+        changes = ModFolderChanges()
+        
+        modlist_key = self._stat_key(self.repository.modlist_path)
+        if modlist_key != self._modlist_key:
+            self._modlist_key = modlist_key
+            if self.repository.modlist_changed_externally():
+                changes.modlist_changed = True
+        
+        # Folders can only appear, disappear or be replaced if the mod folder's own mtime moved
+        root_key = self._stat_key(self.repository.mod_folder)
+        if root_key == self._root_key:
+            return changes
+        self._root_key = root_key
+        
+        mods = {}
+        for name in self.repository.get_mod_folders():
+            key = self._stat_key(self.repository.get_mod_path(name))
+            mods[name] = key
+            if name not in self._mods:
+                changes.added.add(name)
+            elif key != self._mods[name]:
+                changes.modified.add(name)
+        changes.removed.update(self._mods.keys() - mods.keys())
+        self._mods = mods
+        
+        return changes
+    
+    def close(self):
+        pass
+
+
+class ModFolderWatcher:
+    """
+    Watches the mod folder and reports debounced ModFolderChanges.
+    
+    Uses inotify on Linux, so an idle mod folder costs no disk access at
+    all, and falls back to polling two stat() results elsewhere. Raw events are
+    accumulated and only handed out once nothing new has arrived for
+    debounce seconds, so a burst of writes (an unzip, an editor saving)
+    becomes a single change set.
+    """
+    
+    def __init__(self, repository: ModRepository, debounce: float = 0.5):
+        self.debounce = debounce
+        self._pending = ModFolderChanges()
+        self._last_event = 0.0
+        
+        self._backend = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._backend = _InotifyBackend(repository)
+            except (OSError, AttributeError):
+                self._backend = None
+        if self._backend is None:
+            self._backend = _PollingBackend(repository)
+    
+    @property
+    def is_event_driven(self) -> bool:
+        return self._backend.fileno() is not None
+    
+    def fileno(self) -> Optional[int]:
+        """File descriptor that becomes readable when events arrive, or None when polling."""
+        return self._backend.fileno()
+    
+    @property
+    def has_pending(self) -> bool:
+        return not self._pending.is_empty
+    
+    def poll(self) -> Optional[ModFolderChanges]:
+        """
+        Collect new events and return the accumulated changes once quiet.
+        
+        Returns:
+            The debounced change set, or None if nothing is ready yet.
+        """
+        changes = self._backend.read()
+        now = time.monotonic()
+        
+        if not changes.is_empty:
+            self._pending.merge(changes)
+            self._last_event = now
+        
+        if self._pending.is_empty or now - self._last_event < self.debounce:
+            return None
+        
+        ready = self._pending
+        self._pending = ModFolderChanges()
+        return ready
+    
+    def close(self):
+        self._backend.close()
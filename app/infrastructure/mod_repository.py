@@ -1,13 +1,67 @@
+import hashlib
 import json
 import os
+import threading
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Dict, Any
 from pathlib import Path
+from app.utils.logging_utils import get_logger
+
+METADATA_CACHE_NAME = ".mewtator_cache.json"
+METADATA_CACHE_VERSION = 4
+DESCRIPTION_FILENAMES = ("description.json", "info.json", "modinfo.json")
+PREVIEW_EXTENSIONS = ("png", "jpg", "jpeg", "webp")
+# Saves of modlist.txt within this many seconds of each other are written once
+MODLIST_SAVE_DELAY = 0.5
+
+
+@dataclass
+class ModFolderEntry:
+    name: str
+    path: str
+    mtime_ns: int
+    desc_path: Optional[str] = None
+    desc_mtime_ns: Optional[int] = None
+    desc_size: Optional[int] = None
+    preview_path: Optional[str] = None
+
+
+@dataclass
+class ModFolderSnapshot:
+    mods: Dict[str, ModFolderEntry] = field(default_factory=dict)
+    
+    @property
+    def mod_names(self) -> List[str]:
+        return sorted(self.mods)
+    
+    def get(self, name: str) -> Optional[ModFolderEntry]:
+        return self.mods.get(name)
+
+
+class _PathEntry:
+    """Minimal DirEntry stand-in for scanning a single mod directory by path."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+    
+    def stat(self):
+        return os.stat(self.path)
 
 
 class ModRepository:
     def __init__(self, mod_folder: str):
         self.mod_folder = mod_folder
         self.modlist_path = os.path.join(mod_folder, "modlist.txt")
+        self.cache_path = os.path.join(mod_folder, METADATA_CACHE_NAME)
+        self._metadata_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._metadata_cache_dirty = False
+        self._metadata_cache_lock = threading.Lock()
+        self._modlist_lock = threading.Lock()
+        self._modlist_pending: Optional[str] = None
+        self._modlist_timer: Optional[threading.Timer] = None
+        self._modlist_digest: Optional[bytes] = None
+        self._modlist_stat: Optional[Tuple[int, int]] = None
         self._ensure_folder_structure()
     
     def _ensure_folder_structure(self):
@@ -17,63 +71,367 @@ class ModRepository:
                 f.write("")
     
     def load_enabled_mod_names(self) -> List[str]:
-        if not os.path.exists(self.modlist_path):
-            return []
+        with self._modlist_lock:
+            if self._modlist_pending is not None and not self._modlist_edited_elsewhere():
+                # A debounced save has not reached the disk yet
+                content = self._modlist_pending
+            else:
+                # An edit made elsewhere while a save was pending wins over it
+                self._discard_pending_save()
+                try:
+                    key = self._stat_key(self.modlist_path)
+                    with open(self.modlist_path, "rb") as f:
+                        data = f.read()
+                except FileNotFoundError:
+                    return []
+                self._modlist_digest = self._digest(data)
+                self._modlist_stat = key
+                content = data.decode("utf-8")
         
         mods = []
-        with open(self.modlist_path, "r", encoding="utf-8") as f:
-            for line in f:
-                name = line.strip()
-                if name:
-                    mods.append(name)
+        for line in content.splitlines():
+            name = line.strip()
+            if name:
+                mods.append(name)
         return mods
     
-    def save_enabled_mod_names(self, mod_names: List[str]):
-        with open(self.modlist_path, "w", encoding="utf-8") as f:
-            for name in mod_names:
-                f.write(name + "\n")
+    def save_enabled_mod_names(self, mod_names: List[str], delay: float = MODLIST_SAVE_DELAY):
+        """
+        Save the enabled mod order to modlist.txt.
+        
+        Saves are debounced: the file is written once, delay seconds after
+        the last call, unless flush() writes it sooner. The write goes to a
+        temporary file that replaces modlist.txt, and is skipped entirely if
+        the content is unchanged.
+        """
+        content = "".join(name + "\n" for name in mod_names)
+        
+        with self._modlist_lock:
+            self._modlist_pending = content
+            if self._modlist_timer is not None:
+                self._modlist_timer.cancel()
+                self._modlist_timer = None
+            if delay > 0:
+                self._modlist_timer = threading.Timer(delay, self._flush_in_background)
+                self._modlist_timer.daemon = True
+                self._modlist_timer.start()
+                return
+        
+        self.flush()
+    
+    def flush(self):
+        """
+        Write any pending modlist.txt save now.
+        
+        If modlist.txt was edited by something else since it was last read
+        or written here, the pending save is dropped rather than overwriting
+        that edit; the mod folder watcher then reports the file as changed.
+        """
+        with self._modlist_lock:
+            content = self._modlist_pending
+            self._discard_pending_save()
+            if content is None:
+                return
+            
+            if self._modlist_edited_elsewhere():
+                get_logger().info("modlist.txt was changed outside Mewtator; not overwriting it")
+                return
+            
+            data = content.encode("utf-8")
+            digest = self._digest(data)
+            if digest == self._modlist_digest and os.path.exists(self.modlist_path):
+                return
+            
+            tmp_path = self.modlist_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                # The data must be on disk before the rename makes it modlist.txt
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.modlist_path)
+            
+            self._modlist_digest = digest
+            self._modlist_stat = self._stat_key(self.modlist_path)
+    
+    def _discard_pending_save(self):
+        # Callers hold _modlist_lock
+        if self._modlist_timer is not None:
+            self._modlist_timer.cancel()
+            self._modlist_timer = None
+        self._modlist_pending = None
+    
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except OSError as e:
+            get_logger().error("Failed to save modlist.txt: %s", e)
+    
+    def modlist_changed_externally(self) -> bool:
+        """
+        Check whether modlist.txt differs from what was last loaded or saved.
+        
+        Lets the mod folder watcher ignore the repository's own writes. The
+        file is only hashed if its mtime or size no longer match our write.
+        """
+        with self._modlist_lock:
+            return self._modlist_changed_on_disk()
+    
+    def _modlist_changed_on_disk(self) -> bool:
+        # Callers hold _modlist_lock
+        key = self._stat_key(self.modlist_path)
+        if key is not None and key == self._modlist_stat:
+            return False
+        
+        try:
+            with open(self.modlist_path, "rb") as f:
+                digest = self._digest(f.read())
+        except OSError:
+            digest = None
+        
+        if digest is not None and digest == self._modlist_digest:
+            self._modlist_stat = key
+            return False
+        return True
+    
+    def _modlist_edited_elsewhere(self) -> bool:
+        # Callers hold _modlist_lock. Only an existing file we have read or
+        # written before can have been edited by someone else.
+        return (
+            self._modlist_digest is not None
+            and os.path.exists(self.modlist_path)
+            and self._modlist_changed_on_disk()
+        )
+    
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    @staticmethod
+    def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
     
     def get_mod_folders(self) -> List[str]:
-        if not os.path.isdir(self.mod_folder):
-            return []
+        return self.scan(include_contents=False).mod_names
+    
+    def scan(self, include_contents: bool = True) -> ModFolderSnapshot:
+        """
+        Scan the mod folder in a single pass per directory.
+        
+        Uses os.scandir so folder checks come from the cached DirEntry type
+        instead of a separate isdir call per entry. With include_contents,
+        each mod directory is listed once as well to find its description
+        file, preview image and their stat data.
+        """
+        mods: Dict[str, ModFolderEntry] = {}
+        
+        try:
+            it = os.scandir(self.mod_folder)
+        except OSError:
+            return ModFolderSnapshot(mods)
+        
+        with it:
+            for entry in it:
+                try:
+                    if not entry.is_dir():
+                        continue
+                    if include_contents:
+                        mods[entry.name] = self._scan_mod_dir(entry)
+                    else:
+                        mods[entry.name] = ModFolderEntry(entry.name, entry.path, 0)
+                except OSError:
+                    continue
         
-        return sorted([
-            d for d in os.listdir(self.mod_folder)
-            if os.path.isdir(os.path.join(self.mod_folder, d))
-        ])
+        return ModFolderSnapshot(mods)
     
-    def load_mod_metadata(self, mod_name: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    def scan_mod(self, mod_name: str) -> Optional[ModFolderEntry]:
         mod_path = os.path.join(self.mod_folder, mod_name)
+        try:
+            if not os.path.isdir(mod_path):
+                return None
+            return self._scan_mod_dir(_PathEntry(mod_path))
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _scan_mod_dir(dir_entry: os.DirEntry) -> ModFolderEntry:
+        desc_candidates: Dict[str, os.DirEntry] = {}
+        preview_path = None
         
-        if not os.path.isdir(mod_path):
-            return {}, None
+        with os.scandir(dir_entry.path) as it:
+            for entry in it:
+                lowered = entry.name.lower()
+                if lowered in DESCRIPTION_FILENAMES:
+                    # Case-insensitive like the filesystems on Windows and macOS,
+                    # preferring the exact name if both spellings exist
+                    if entry.name == lowered or lowered not in desc_candidates:
+                        desc_candidates[lowered] = entry
+                elif preview_path is None and lowered.startswith("preview") and lowered.split(".")[-1] in PREVIEW_EXTENSIONS:
+                    preview_path = entry.path
         
-        desc_filenames = ["description.json", "info.json", "modinfo.json"]
         desc_path = None
-        
-        for filename in desc_filenames:
-            potential_path = os.path.join(mod_path, filename)
-            if os.path.isfile(potential_path):
-                desc_path = potential_path
+        desc_mtime_ns = None
+        desc_size = None
+        for filename in DESCRIPTION_FILENAMES:
+            candidate = desc_candidates.get(filename)
+            if candidate is not None and candidate.is_file():
+                desc_stat = candidate.stat()
+                desc_path = candidate.path
+                desc_mtime_ns = desc_stat.st_mtime_ns
+                desc_size = desc_stat.st_size
                 break
         
+        return ModFolderEntry(
+            name=dir_entry.name,
+            path=dir_entry.path,
+            mtime_ns=dir_entry.stat().st_mtime_ns,
+            desc_path=desc_path,
+            desc_mtime_ns=desc_mtime_ns,
+            desc_size=desc_size,
+            preview_path=preview_path,
+        )
+    
+    def load_mod_metadata(self, mod_name: str, entry: Optional[ModFolderEntry] = None) -> Tuple[Dict[str, Any], Optional[str]]:
+        metadata, preview_path, _ = self.read_mod_metadata(mod_name, entry)
+        return metadata, preview_path
+    
+    def read_mod_metadata(self, mod_name: str, entry: Optional[ModFolderEntry] = None) -> Tuple[Dict[str, Any], Optional[str], Optional[str]]:
+        """
+        Load a mod's description metadata and preview image path.
+        
+        Results are cached in the mod folder and reused while the mod
+        directory's mtime and the description file's mtime/size are
+        unchanged. Passing the mod's entry from scan() lets the cache be
+        validated and the files located without touching the disk again.
+        Safe to call from several threads at once.
+        
+        The "description" field is left out, so the cache never holds the
+        mods' descriptions; load_mod_description reads one when needed.
+        
+        Returns:
+            Tuple of (metadata, preview_path, error) where error describes why
+            the description file could not be used, or None.
+        """
+        if entry is None:
+            entry = self.scan_mod(mod_name)
+            if entry is None:
+                return {}, None, None
+        
+        with self._metadata_cache_lock:
+            cached = self._load_metadata_cache().get(mod_name)
+        # Entries are replaced, never changed in place, so this is safe unlocked
+        if (
+            cached
+            and cached.get("dir_mtime") == entry.mtime_ns
+            and cached.get("desc_path") == entry.desc_path
+            and cached.get("desc_mtime") == entry.desc_mtime_ns
+            and cached.get("desc_size") == entry.desc_size
+        ):
+            return cached["metadata"], entry.preview_path, cached.get("error")
+        
         metadata = {}
+        error = None
         
-        if desc_path:
+        if entry.desc_path:
             try:
-                with open(desc_path, "r", encoding="utf-8") as f:
+                with open(entry.desc_path, "r", encoding="utf-8") as f:
                     metadata = json.load(f)
-            except Exception:
+                if not isinstance(metadata, dict):
+                    metadata = {}
+                    error = f"{os.path.basename(entry.desc_path)} must contain a JSON object"
+            except (OSError, ValueError) as e:
                 metadata = {}
+                error = f"{os.path.basename(entry.desc_path)}: {e}"
+        metadata.pop("description", None)
         
-        preview_path = None
-        for name in os.listdir(mod_path):
-            ext = name.lower().split(".")[-1]
-            if name.lower().startswith("preview") and ext in ("png", "jpg", "jpeg", "webp"):
-                preview_path = os.path.join(mod_path, name)
-                break
+        with self._metadata_cache_lock:
+            self._load_metadata_cache()[mod_name] = {
+                "dir_mtime": entry.mtime_ns,
+                "desc_path": entry.desc_path,
+                "desc_mtime": entry.desc_mtime_ns,
+                "desc_size": entry.desc_size,
+                "metadata": metadata,
+                "error": error,
+            }
+            self._metadata_cache_dirty = True
         
-        return metadata, preview_path
+        return metadata, entry.preview_path, error
+    
+    def load_mod_description(self, mod_name: str) -> Any:
+        """
+        Read a mod's description from its description file.
+        
+        The file is located through the metadata cache when the mod is in
+        it, so this is a single file read without listing the directory.
+        
+        Returns:
+            The description, or "" if there is none or it cannot be read.
+        """
+        with self._metadata_cache_lock:
+            cached = self._load_metadata_cache().get(mod_name)
+        if cached is not None:
+            desc_path = cached.get("desc_path")
+        else:
+            entry = self.scan_mod(mod_name)
+            desc_path = entry.desc_path if entry else None
+        
+        if not desc_path:
+            return ""
+        try:
+            with open(desc_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return ""
+        if not isinstance(metadata, dict):
+            return ""
+        return metadata.get("description", "")
+    
+    def _load_metadata_cache(self) -> Dict[str, Dict[str, Any]]:
+        # Callers hold _metadata_cache_lock for every read and write of the cache
+        if self._metadata_cache is None:
+            cache = {}
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == METADATA_CACHE_VERSION:
+                    cache = data.get("mods", {})
+            except (OSError, ValueError):
+                pass
+            self._metadata_cache = cache
+        return self._metadata_cache
+    
+    def save_metadata_cache(self, mod_names: Optional[List[str]] = None):
+        """
+        Persist the metadata cache if anything was re-read.
+        
+        Args:
+            mod_names: If given, cache entries for any other mod are dropped.
+        """
+        with self._metadata_cache_lock:
+            cache = self._load_metadata_cache()
+            
+            if mod_names is not None:
+                keep = set(mod_names)
+                stale = [name for name in cache if name not in keep]
+                for name in stale:
+                    del cache[name]
+                if stale:
+                    self._metadata_cache_dirty = True
+            
+            if not self._metadata_cache_dirty:
+                return
+            
+            tmp_path = self.cache_path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": METADATA_CACHE_VERSION, "mods": cache}, f)
+                os.replace(tmp_path, self.cache_path)
+                self._metadata_cache_dirty = False
+            except OSError:
+                pass
     
     def mod_exists(self, mod_name: str) -> bool:
         mod_path = os.path.join(self.mod_folder, mod_name)
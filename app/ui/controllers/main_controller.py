@@ -1,4 +1,6 @@
 import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, Toplevel, Label, Text, Button, WORD, BOTH, filedialog, simpledialog
 from tkinter import ttk
@@ -7,16 +9,25 @@ from app.core.services.mod_service import ModService
 from app.core.services.config_service import ConfigService
 from app.core.services.game_launcher_service import GameLauncherService
 from app.core.services.translation_service import TranslationService
-from app.core.services.pack_service import PackService
+from app.core.services.pack_service import PackService, PackCancelled
 from app.core.services.modlist_io_service import ModListIOService
 from app.core.services.theme_service import ThemeService
 from app.ui.windows.main_window import MainWindow
 from app.ui.windows.settings_window import SettingsWindow
 from app.ui.windows.progress_window import ProgressWindow
+from app.infrastructure.mod_folder_watcher import ModFolderWatcher
 from app.utils.logging_utils import get_logger
 from app.utils.platform_utils import open_file_or_folder
 
 
+# Progress is redrawn at most this often while a pack operation runs (~20 Hz)
+PACK_POLL_MS = 50
+# Mod folder polling interval when kernel change notifications are unavailable
+WATCH_POLL_MS = 1000
+# Quiet period before a burst of mod folder changes is applied
+WATCH_DEBOUNCE_MS = 500
+
+
 class MainController:
     def __init__(
         self,
@@ -42,11 +53,18 @@ class MainController:
         self.mod_list: ModList = None
         self.window: MainWindow = None
         
-        self.last_mtime = 0
-        self.last_mod_folders = set()
+        self.watcher: ModFolderWatcher = None
+        self._check_reload_id = None
         
         self.drag_data = {"source": None, "index": None, "changed": False}
         self.drag_indicator = None
+        
+        # (mod, description) of the mod last shown in the preview panel
+        self._previewed_description = None
+        
+        self._pack_task = None
+        self._pack_cancel = None
+        self._pack_poll_id = None
     
     def start(self):
         if not self.config_service.validate_config(self.config):
@@ -62,12 +80,14 @@ class MainController:
         self._build_main_window()
         self._setup_auto_refresh()
         self.root.mainloop()
+        self._stop_pack_task()
+        self.mod_service.flush_mod_order()
     
     def _build_main_window(self):
         self.theme_service.set_theme(self.config.theme)
         self.window = MainWindow(self.root, self.translation_service)
         
-        self.mod_list = self.mod_service.load_mods()
+        self.mod_list = self.mod_service.load_mods(lazy=True)
         self.mod_list.add_observer(self._on_mod_list_changed)
         
         self.window.set_disabled_list_action(self._disable_all)
@@ -192,9 +212,14 @@ class MainController:
             if item_name in items:
                 target_widget.select_item(items.index(item_name))
     
-    def _on_mod_list_changed(self):
-        self.mod_service.validate_requirements(self.mod_list)
-        self.mod_service.save_mod_order(self.mod_list)
+    def _on_mod_list_changed(self, changes=None):
+        self.mod_service.revalidate_requirements(self.mod_list, changes)
+        if changes is None or changes.updated or changes.removed:
+            # The previewed mod's description may have changed on disk
+            self._previewed_description = None
+        if changes is None or not changes.from_disk:
+            # Changes read from modlist.txt are already on disk
+            self.mod_service.save_mod_order(self.mod_list)
         self._refresh_lists()
     
     def _update_preview_from_disabled(self):
@@ -204,7 +229,7 @@ class MainController:
             mod = self.mod_list.get_mod_by_name(name)
             if mod:
                 self.window.preview_panel.update_preview(
-                    mod.title, mod.author, mod.version, mod.description, mod.preview_path, mod.url
+                    mod.title, mod.author, mod.version, self._description_of(mod), mod.preview_path, mod.url
                 )
     
     def _update_preview_from_enabled(self):
@@ -214,9 +239,15 @@ class MainController:
             mod = self.mod_list.get_mod_by_name(name)
             if mod:
                 self.window.preview_panel.update_preview(
-                    mod.title, mod.author, mod.version, mod.description, mod.preview_path, mod.url
+                    mod.title, mod.author, mod.version, self._description_of(mod), mod.preview_path, mod.url
                 )
     
+    def _description_of(self, mod) -> str:
+        # Descriptions are read from disk on demand; keep only the previewed one
+        if self._previewed_description is None or self._previewed_description[0] is not mod:
+            self._previewed_description = (mod, mod.description)
+        return self._previewed_description[1]
+    
     def _enable_all(self):
         self.mod_list.enable_all()
     
@@ -391,6 +422,10 @@ class MainController:
             label=self.translation_service.get("context_menu.enable"),
             command=lambda: self.mod_list.enable_mod(name)
         )
+        menu.add_command(
+            label=self.translation_service.get("context_menu.enable_with_requirements", "Enable with Requirements"),
+            command=lambda: self._enable_with_requirements(name)
+        )
         menu.post(event.x_root, event.y_root)
     
     def _show_context_menu_enabled(self, event):
@@ -417,9 +452,34 @@ class MainController:
             label=self.translation_service.get("context_menu.disable"),
             command=lambda: self.mod_list.disable_mod(name)
         )
+        mod = self.mod_list.get_mod_by_name(name)
+        if mod and mod.has_unmet_requirements:
+            menu.add_command(
+                label=self.translation_service.get("context_menu.enable_requirements", "Enable Required Mods"),
+                command=lambda: self._enable_with_requirements(name)
+            )
         menu.post(event.x_root, event.y_root)
     
+    def _enable_with_requirements(self, name: str):
+        resolution = self.mod_service.resolve_requirements(self.mod_list, [name])
+        
+        if not resolution.is_satisfiable:
+            result = messagebox.askyesno(
+                self.translation_service.get("alerts.requirement_conflict", "Requirement Conflicts"),
+                self.translation_service.get("alerts.requirement_unresolved_text", "Some requirements cannot be met:\n\n{errors}\n\nEnable the other mods anyway?").format(errors="\n".join(resolution.conflicts))
+            )
+            if not result:
+                return
+        
+        with self.mod_list.batch():
+            for mod_name in resolution.to_enable:
+                self.mod_list.enable_mod(mod_name)
+            self.mod_list.set_order(resolution.order)
+    
     def _launch_game(self):
+        # Make sure modlist.txt matches the order being launched
+        self.mod_service.flush_mod_order()
+        
         missing = self.mod_service.get_missing_mod_names(self.mod_list)
         if missing:
             messagebox.showerror(
@@ -428,7 +488,8 @@ class MainController:
             )
             return
         
-        req_errors = self.mod_service.validate_requirements(self.mod_list)
+        # Kept up to date by _on_mod_list_changed on every edit
+        req_errors = self.mod_service.get_requirement_errors(self.mod_list)
         if req_errors:
             error_msg = "\n".join(req_errors)
             result = messagebox.askyesno(
@@ -678,35 +739,118 @@ class MainController:
         output_dir = os.path.join(self.config.mod_folder, "_unpacked")
         os.makedirs(output_dir, exist_ok=True)
         
-        pw = ProgressWindow(self.root, self.translation_service.get("progress.unpacking"), 100)
-        
-        try:
-            def progress(current, total):
-                pw.update(int((current / total) * 100))
-            
-            self.pack_service.unpack(self.config.game_install_dir, output_dir, progress)
-            pw.close()
-            messagebox.showinfo("Success", "Unpacking complete!")
-        except Exception as e:
-            pw.close()
-            messagebox.showerror("Error", str(e))
+        self._run_pack_task(
+            self.translation_service.get("progress.unpacking"),
+            lambda progress, cancel_event: self.pack_service.unpack(
+                self.config.game_install_dir, output_dir, progress, cancel_event=cancel_event
+            ),
+            "Unpacking complete!"
+        )
     
     def _repack(self):
         source_dir = os.path.join(self.config.mod_folder, "_unpacked")
         gpak_output = os.path.join(self.config.game_install_dir, "resources.gpak")
         
-        pw = ProgressWindow(self.root, self.translation_service.get("progress.repacking"), 100)
+        self._run_pack_task(
+            self.translation_service.get("progress.repacking"),
+            lambda progress, cancel_event: self.pack_service.repack(
+                source_dir, gpak_output, progress, cancel_event=cancel_event
+            ),
+            "Repacking complete!"
+        )
+    
+    def _run_pack_task(self, title, task, success_message):
+        """
+        Run a PackService operation on a worker thread.
+        
+        The worker only posts to a queue; the Tk thread drains it on an
+        after() timer, so progress redraws are capped at PACK_POLL_MS no
+        matter how many entries the archive has.
+        """
+        if self._pack_task is not None:
+            return
+        
+        events = queue.Queue()
+        cancel_event = threading.Event()
         
-        try:
-            def progress(current, total):
-                pw.update(int((current / total) * 100))
+        pw = ProgressWindow(
+            self.root,
+            title,
+            100,
+            on_cancel=cancel_event.set,
+            cancel_text=self.translation_service.get("progress.cancel", "Cancel")
+        )
+        
+        def progress(pack_progress):
+            events.put(("progress", pack_progress))
+        
+        def run():
+            try:
+                task(progress, cancel_event)
+                events.put(("done",))
+            except PackCancelled:
+                events.put(("cancelled",))
+            except Exception as e:
+                events.put(("error", e))
+        
+        worker = threading.Thread(target=run, daemon=True)
+        self._pack_task = worker
+        self._pack_cancel = cancel_event
+        worker.start()
+        
+        def poll():
+            latest = None
+            result = None
+            try:
+                while True:
+                    event = events.get_nowait()
+                    if event[0] == "progress":
+                        latest = event
+                    else:
+                        result = event
+            except queue.Empty:
+                pass
             
-            self.pack_service.repack(source_dir, gpak_output, progress)
-            pw.close()
-            messagebox.showinfo("Success", "Repacking complete!")
-        except Exception as e:
+            if latest is not None:
+                pw.set_progress(latest[1])
+            
+            if result is None:
+                self._pack_poll_id = self.root.after(PACK_POLL_MS, poll)
+                return
+            
+            self._pack_task = self._pack_cancel = self._pack_poll_id = None
             pw.close()
-            messagebox.showerror("Error", str(e))
+            if result[0] == "done":
+                messagebox.showinfo("Success", success_message)
+            elif result[0] == "cancelled":
+                messagebox.showinfo(
+                    self.translation_service.get("progress.cancelled_title", "Cancelled"),
+                    self.translation_service.get("progress.cancelled", "The operation was cancelled.")
+                )
+            else:
+                messagebox.showerror("Error", str(result[1]))
+        
+        self._pack_poll_id = self.root.after(PACK_POLL_MS, poll)
+    
+    def _stop_pack_task(self):
+        """
+        Cancel a running pack task and wait for its worker to finish.
+        
+        Called before the root window goes away, so the worker can clean up
+        its partial output and the progress poll never runs against a
+        destroyed root.
+        """
+        if self._pack_task is None:
+            return
+        
+        self._pack_cancel.set()
+        self._pack_task.join()
+        if self._pack_poll_id is not None:
+            try:
+                self.root.after_cancel(self._pack_poll_id)
+            except tk.TclError:
+                pass
+        self._pack_task = self._pack_cancel = self._pack_poll_id = None
     
     def _import_modlist(self):
         with self.theme_service.file_dialog_safe_theme():
@@ -739,7 +883,11 @@ class MainController:
                     f"Imported {len(valid_names)} mods successfully.\n{missing_count} mods were not found in your mods folder."
                 )
             
-            self.mod_list.set_order(valid_names)
+            # One validation, save and redraw for the whole import
+            with self.mod_list.batch():
+                for name in valid_names:
+                    self.mod_list.enable_mod(name)
+                self.mod_list.set_order(valid_names)
             messagebox.showinfo("Success", f"Imported {len(valid_names)} mods!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to import modlist: {str(e)}")
@@ -834,10 +982,9 @@ class MainController:
             )
     
     def _reload_ui(self):
-        try:
-            self.root.after_cancel(self._check_reload_id)
-        except (AttributeError, ValueError):
-            pass
+        self._stop_auto_refresh()
+        self._stop_pack_task()
+        self.mod_service.flush_mod_order()
         
         self.root.destroy()
         
@@ -862,33 +1009,56 @@ class MainController:
         new_controller.start()
     
     def _setup_auto_refresh(self):
-        from app.infrastructure.mod_repository import ModRepository
-        
-        repo = ModRepository(self.config.mod_folder)
-        self.last_mtime = repo.get_modlist_mtime()
-        self.last_mod_folders = set(repo.get_mod_folders())
-        
-        self._check_reload_id = self.root.after(1000, self._check_reload)
+        self.watcher = ModFolderWatcher(self.mod_service.repository)
+        self._check_reload_id = None
+        
+        fd = self.watcher.fileno()
+        if fd is not None and hasattr(self.root.tk, "createfilehandler"):
+            # Wake up only when the kernel reports a change
+            self.root.tk.createfilehandler(fd, tk.READABLE, lambda *_: self._on_watch_event())
+        else:
+            self._check_reload_id = self.root.after(WATCH_POLL_MS, self._check_reload)
+    
+    def _stop_auto_refresh(self):
+        if self._check_reload_id is not None:
+            try:
+                self.root.after_cancel(self._check_reload_id)
+            except (tk.TclError, ValueError):
+                pass
+            self._check_reload_id = None
+        
+        if self.watcher is not None:
+            fd = self.watcher.fileno()
+            if fd is not None and hasattr(self.root.tk, "deletefilehandler"):
+                try:
+                    self.root.tk.deletefilehandler(fd)
+                except tk.TclError:
+                    pass
+            self.watcher.close()
+            self.watcher = None
+    
+    def _on_watch_event(self):
+        # Drain the events now; the debounce timer applies them once quiet
+        self._apply_mod_folder_changes(self.watcher.poll())
+        if self.watcher is not None and self.watcher.has_pending and self._check_reload_id is None:
+            self._check_reload_id = self.root.after(WATCH_DEBOUNCE_MS, self._check_reload)
     
     def _check_reload(self):
-        from app.infrastructure.mod_repository import ModRepository
+        self._check_reload_id = None
+        if self.watcher is None:
+            return
+        
+        self._apply_mod_folder_changes(self.watcher.poll())
         
-        repo = ModRepository(self.config.mod_folder)
-        
-        mtime = repo.get_modlist_mtime()
-        if mtime != self.last_mtime:
-            self.last_mtime = mtime
-            self.mod_list = self.mod_service.load_mods()
-            self.mod_list.add_observer(self._on_mod_list_changed)
-            self.mod_service.validate_requirements(self.mod_list)
-            self._refresh_lists()
-        
-        current_mod_folders = set(repo.get_mod_folders())
-        if current_mod_folders != self.last_mod_folders:
-            self.last_mod_folders = current_mod_folders
-            self.mod_list = self.mod_service.load_mods()
-            self.mod_list.add_observer(self._on_mod_list_changed)
-            self.mod_service.validate_requirements(self.mod_list)
-            self._refresh_lists()
-        
-        self._check_reload_id = self.root.after(1000, self._check_reload)
+        if self.watcher is None:
+            return
+        if not self.watcher.is_event_driven:
+            self._check_reload_id = self.root.after(WATCH_POLL_MS, self._check_reload)
+        elif self.watcher.has_pending:
+            self._check_reload_id = self.root.after(WATCH_DEBOUNCE_MS, self._check_reload)
+    
+    def _apply_mod_folder_changes(self, changes):
+        if changes is None:
+            return
+        # Observers refresh the lists once if anything actually changed
+        self.mod_service.reconcile(self.mod_list, changes)
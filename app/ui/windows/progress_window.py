@@ -1,16 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
 
+MB = 1024 * 1024
+
+
 class ProgressWindow:
-    def __init__(self, root, title, maximum):
+    def __init__(self, root, title, maximum, on_cancel=None, cancel_text="Cancel"):
         # Create a top-level window
         self.win = tk.Toplevel(root)
         self.win.title(title)
-        self.win.geometry("500x160")  # Larger for Steam Deck
+        self.win.geometry("500x230" if on_cancel else "500x190")  # Larger for Steam Deck
         self.win.resizable(False, False)
 
-        # Prevent user from closing mid-operation
-        self.win.protocol("WM_DELETE_WINDOW", lambda: None)
+        # Closing the window cancels the operation if it can be cancelled
+        self.win.protocol("WM_DELETE_WINDOW", self._cancel if on_cancel else (lambda: None))
+        self._on_cancel = on_cancel
 
         # Title label
         self.label = tk.Label(self.win, text=title, font=("Arial", 13))
@@ -30,18 +34,40 @@ class ProgressWindow:
         self.percent_label = tk.Label(self.win, text="0%", font=("Arial", 11))
         self.percent_label.pack()
 
+        # Bytes, throughput and time left
+        self.detail_label = tk.Label(self.win, text="", font=("Arial", 10))
+        self.detail_label.pack()
+
+        self.cancel_button = None
+        if on_cancel:
+            self.cancel_button = ttk.Button(self.win, text=cancel_text, command=self._cancel, width=20)
+            self.cancel_button.pack(pady=10)
+
         # Force initial draw
         self.win.update()
 
     def update(self, value):
         self.pb["value"] = value
 
-        # Update percentage text
+        # Update percentage text; the Tk main loop redraws on its own
         percent = int((value / self.pb["maximum"]) * 100)
         self.percent_label.config(text=f"{percent}%")
 
-        # Keep UI responsive
-        self.win.update()
+    def set_progress(self, progress):
+        self.update(progress.fraction * self.pb["maximum"])
+
+        detail = f"{progress.bytes_done / MB:.1f} / {progress.bytes_total / MB:.1f} MB  |  {progress.megabytes_per_second:.1f} MB/s"
+        eta = progress.eta_seconds
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            detail += f"  |  {minutes}:{seconds:02d} left"
+        self.detail_label.config(text=detail)
+
+    def _cancel(self):
+        if self.cancel_button is not None:
+            self.cancel_button.state(["disabled"])
+        if self._on_cancel:
+            self._on_cancel()
 
     def close(self):
         self.win.destroy()
@@ -0,0 +1,174 @@
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+
+def strongly_connected_components(nodes: Iterable[str], edges: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """
+    Find the strongly connected components of a directed graph (Tarjan).
+    
+    Iterative, so long dependency chains cannot hit the recursion limit.
+    Edges to nodes that are not in nodes are ignored.
+    
+    Returns:
+        Components in reverse topological order, each a list of nodes.
+    """
+    nodes = list(dict.fromkeys(nodes))
+    known = set(nodes)
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    components = []
+    counter = 0
+    
+    for root in nodes:
+        if root in index:
+            continue
+        
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in known:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            
+            if advanced:
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    
+    return components
+
+
+def find_cycles(nodes: Iterable[str], edges: Mapping[str, Iterable[str]], key: Callable[[str], Any] = str.lower) -> List[List[str]]:
+    """
+    List the groups of nodes that depend on each other in a cycle.
+    
+    Self-edges are not counted. Each cycle is sorted by key, and the
+    cycles by their first node.
+    """
+    return _cycles(strongly_connected_components(nodes, edges), key)
+
+
+def _cycles(components: List[List[str]], key: Callable[[str], Any]) -> List[List[str]]:
+    cycles = [sorted(component, key=key) for component in components if len(component) > 1]
+    return sorted(cycles, key=lambda cycle: key(cycle[0]))
+
+
+def topological_sort(
+    nodes: Iterable[str],
+    dependencies: Mapping[str, Iterable[str]],
+    key: Callable[[str], Any] = str.lower
+) -> Tuple[List[str], List[List[str]]]:
+    """
+    Order nodes so that each comes after everything it depends on.
+    
+    Kahn's algorithm with a heap on key: whenever several nodes are ready,
+    the smallest key goes first, so the result is deterministic and
+    alphabetical wherever the dependencies allow. Runs in
+    O((n + e) log n). Dependencies on unknown nodes and on the node itself
+    are ignored.
+    
+    If the dependencies are cyclic, a cycle is broken by placing the
+    smallest node of a cycle whose dependencies outside the cycle are all
+    placed. Nodes that merely depend on a cycle still come after it.
+    
+    Args:
+        nodes: Nodes to order; duplicates are dropped
+        dependencies: Maps a node to the nodes that must come before it
+        key: Sort key for ties
+    
+    Returns:
+        Tuple of (order, cycles) where cycles lists the nodes of each
+        dependency cycle found (see find_cycles).
+    """
+    nodes = list(dict.fromkeys(nodes))
+    known = set(nodes)
+    
+    requires: Dict[str, List[str]] = {}
+    dependents: Dict[str, List[str]] = {node: [] for node in nodes}
+    remaining: Dict[str, int] = {}
+    for node in nodes:
+        deps = [dep for dep in dict.fromkeys(dependencies.get(node, ())) if dep in known and dep != node]
+        requires[node] = deps
+        remaining[node] = len(deps)
+        for dep in deps:
+            dependents[dep].append(node)
+    
+    components = strongly_connected_components(nodes, requires)
+    cycles = _cycles(components, key)
+    
+    # For each cyclic component, how many of its dependencies on nodes
+    # outside it are not placed yet. Only a component at zero may be broken.
+    component_of: Dict[str, int] = {}
+    outside: Dict[int, int] = {}
+    for index, component in enumerate(components):
+        if len(component) > 1:
+            for node in component:
+                component_of[node] = index
+            outside[index] = 0
+    for node, index in component_of.items():
+        outside[index] += sum(1 for dep in requires[node] if component_of.get(dep) != index)
+    
+    ready = [(key(node), node) for node in nodes if not remaining[node]]
+    heapq.heapify(ready)
+    # Members of cycles that may be broken, for when nothing is ready
+    breakable = [(key(node), node) for node, index in component_of.items() if not outside[index]]
+    heapq.heapify(breakable)
+    
+    order = []
+    placed = set()
+    while len(order) < len(nodes):
+        if ready:
+            _, node = heapq.heappop(ready)
+        else:
+            _, node = heapq.heappop(breakable)
+        if node in placed:
+            continue
+        
+        placed.add(node)
+        order.append(node)
+        index = component_of.get(node)
+        for dependent in dependents[node]:
+            remaining[dependent] -= 1
+            if not remaining[dependent] and dependent not in placed:
+                heapq.heappush(ready, (key(dependent), dependent))
+            
+            dependent_index = component_of.get(dependent)
+            if dependent_index is not None and dependent_index != index:
+                outside[dependent_index] -= 1
+                if not outside[dependent_index]:
+                    for member in components[dependent_index]:
+                        if member not in placed:
+                            heapq.heappush(breakable, (key(member), member))
+    
+    return order, cycles
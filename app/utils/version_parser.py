@@ -31,34 +31,37 @@ def parse_requirement(req_string: str) -> Optional[Tuple[str, str, str]]:
     return (mod_name, operator, version)
 
 
-def compare_versions(version1: str, version2: str) -> int:
+def parse_version(version) -> Optional[Tuple[int, ...]]:
     """
-    Compare two semantic version strings.
+    Parse a version string like '1.2.0' into a tuple of integers.
     
-    Args:
-        version1: First version string (e.g., '1.0.0')
-        version2: Second version string (e.g., '1.2.0')
-        
     Returns:
-        -1 if version1 < version2
-         0 if version1 == version2
-         1 if version1 > version2
+        The version parts, or None if the version is empty or not numeric
+        (such versions compare equal to anything).
     """
-    if not version1 or not version2:
-        return 0
+    if not version:
+        return None
     
-    # Split versions into parts and convert to integers
     try:
-        parts1 = [int(p) for p in version1.split('.')]
-        parts2 = [int(p) for p in version2.split('.')]
+        return tuple(int(p) for p in version.split('.'))
     except (ValueError, AttributeError):
-        # If parsing fails, treat as equal
+        return None
+
+
+def compare_parsed_versions(parts1: Optional[Tuple[int, ...]], parts2: Optional[Tuple[int, ...]]) -> int:
+    """
+    Compare two versions from parse_version.
+    
+    Returns:
+        -1, 0 or 1 as for compare_versions; 0 if either version is None.
+    """
+    if parts1 is None or parts2 is None:
         return 0
     
     # Pad shorter version with zeros
     max_len = max(len(parts1), len(parts2))
-    parts1.extend([0] * (max_len - len(parts1)))
-    parts2.extend([0] * (max_len - len(parts2)))
+    parts1 = parts1 + (0,) * (max_len - len(parts1))
+    parts2 = parts2 + (0,) * (max_len - len(parts2))
     
     # Compare part by part
     for p1, p2 in zip(parts1, parts2):
@@ -70,27 +73,25 @@ def compare_versions(version1: str, version2: str) -> int:
     return 0
 
 
-def check_requirement(mod_version: str, operator: str, required_version: str) -> bool:
+def compare_versions(version1: str, version2: str) -> int:
     """
-    Check if a mod version satisfies a requirement.
+    Compare two semantic version strings.
     
     Args:
-        mod_version: The version of the mod being checked
-        operator: Comparison operator (>=, <=, >, <, ==, !=)
-        required_version: The version to compare against
+        version1: First version string (e.g., '1.0.0')
+        version2: Second version string (e.g., '1.2.0')
         
     Returns:
-        True if requirement is satisfied, False otherwise.
-        If no operator provided, returns True (no version constraint).
+        -1 if version1 < version2
+         0 if version1 == version2
+         1 if version1 > version2
     """
-    if not operator or not required_version:
-        return True
-    
-    if not mod_version:
-        return False
-    
-    cmp = compare_versions(mod_version, required_version)
-    
+    # Empty or unparsable versions are treated as equal
+    return compare_parsed_versions(parse_version(version1), parse_version(version2))
+
+
+def operator_satisfied(operator: str, cmp: int) -> bool:
+    """Check a compare_versions result against a requirement operator."""
     if operator == '>=':
         return cmp >= 0
     elif operator == '<=':
@@ -105,3 +106,25 @@ def check_requirement(mod_version: str, operator: str, required_version: str) ->
         return cmp != 0
     else:
         return True
+
+
+def check_requirement(mod_version: str, operator: str, required_version: str) -> bool:
+    """
+    Check if a mod version satisfies a requirement.
+    
+    Args:
+        mod_version: The version of the mod being checked
+        operator: Comparison operator (>=, <=, >, <, ==, !=)
+        required_version: The version to compare against
+        
+    Returns:
+        True if requirement is satisfied, False otherwise.
+        If no operator provided, returns True (no version constraint).
+    """
+    if not operator or not required_version:
+        return True
+    
+    if not mod_version:
+        return False
+    
+    return operator_satisfied(operator, compare_versions(mod_version, required_version))
@@ -0,0 +1,16 @@
+import pytest
+from app.infrastructure.gpak_archive import encode_header
+
+
+def _write_gpak(path, files):
+    with open(path, "wb") as f:
+        f.write(encode_header([(name, len(data)) for name, data in files]))
+        for _, data in files:
+            f.write(data)
+    return path
+
+
+@pytest.fixture
+def write_gpak():
+    """Write a gpak holding (path, bytes) pairs in the given order."""
+    return _write_gpak
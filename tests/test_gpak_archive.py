@@ -0,0 +1,114 @@
+import os
+import struct
+import pytest
+from app.infrastructure.gpak_archive import GpakArchive, copy_payload, encode_header
+
+
+FILES = [
+    ("data/b.txt", b"bravo"),
+    ("data/a.txt", b"alpha!"),
+    ("swfs/ui.swf", b"\x00\x01\x02" * 100),
+    ("empty.bin", b""),
+]
+
+
+def table(archive):
+    return [tuple(archive.entry_at(i)) for i in range(len(archive))]
+
+
+def test_encode_header_layout():
+    header = encode_header([("ab", 3), ("c", 0)])
+    assert header == struct.pack("<i", 2) + struct.pack("<h", 2) + b"ab" + struct.pack("<i", 3) + struct.pack("<h", 1) + b"c" + struct.pack("<i", 0)
+
+
+def test_header_parse_keeps_archive_order_and_payloads(tmp_path, write_gpak):
+    gpak = write_gpak(tmp_path / "resources.gpak", FILES)
+    
+    with GpakArchive(str(gpak), use_index=False) as archive:
+        assert archive.paths == [name for name, _ in FILES]
+        assert archive.data_offset == len(encode_header([(name, len(data)) for name, data in FILES]))
+        for name, data in FILES:
+            assert archive.read(name) == data
+    assert not archive.index_path.exists()
+
+
+def test_sidecar_index_reload_gives_the_same_table(tmp_path, write_gpak, monkeypatch):
+    gpak = write_gpak(tmp_path / "resources.gpak", FILES)
+    
+    with GpakArchive(str(gpak)) as archive:
+        parsed = table(archive)
+        data_offset = archive.data_offset
+    assert archive.index_path.exists()
+    
+    def fail(self):
+        raise AssertionError("header parsed although the index is fresh")
+    monkeypatch.setattr(GpakArchive, "_parse_header", fail)
+    
+    with GpakArchive(str(gpak)) as archive:
+        assert table(archive) == parsed
+        assert archive.data_offset == data_offset
+        assert archive.read("data/a.txt") == b"alpha!"
+
+
+@pytest.mark.parametrize("change", ["mtime", "size"])
+def test_stale_index_is_ignored(tmp_path, write_gpak, change):
+    gpak = write_gpak(tmp_path / "resources.gpak", FILES)
+    with GpakArchive(str(gpak)):
+        pass
+    
+    if change == "mtime":
+        # Same size, different contents and mtime
+        files = [(name, data.upper()) for name, data in FILES]
+        write_gpak(gpak, files)
+        st = os.stat(gpak)
+        os.utime(gpak, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    else:
+        files = FILES + [("new.txt", b"new")]
+        write_gpak(gpak, files)
+    
+    with GpakArchive(str(gpak)) as archive:
+        assert archive.paths == [name for name, _ in files]
+        for name, data in files:
+            assert archive.read(name) == data
+
+
+@pytest.mark.parametrize("cut", [2, 9, 20])
+def test_truncated_header_raises_value_error(tmp_path, write_gpak, cut):
+    data = write_gpak(tmp_path / "full.gpak", FILES).read_bytes()
+    gpak = tmp_path / "resources.gpak"
+    gpak.write_bytes(data[:cut])
+    
+    with pytest.raises(ValueError):
+        GpakArchive(str(gpak), use_index=False).open()
+
+
+def test_truncated_payload_raises_value_error(tmp_path, write_gpak):
+    data = write_gpak(tmp_path / "full.gpak", FILES).read_bytes()
+    gpak = tmp_path / "resources.gpak"
+    gpak.write_bytes(data[:-10])
+    
+    with pytest.raises(ValueError):
+        GpakArchive(str(gpak), use_index=False).open()
+
+
+def test_copy_payload_copies_a_range(tmp_path, write_gpak):
+    src = tmp_path / "src.bin"
+    src.write_bytes(bytes(range(256)) * 10)
+    dst = tmp_path / "dst.bin"
+    
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        copy_payload(s.fileno(), d.fileno(), 300, offset=100)
+        os.lseek(s.fileno(), 5, os.SEEK_SET)
+        copy_payload(s.fileno(), d.fileno(), 10)
+    
+    data = src.read_bytes()
+    assert dst.read_bytes() == data[100:400] + data[5:15]
+
+
+def test_copy_payload_raises_when_the_source_is_short(tmp_path, write_gpak):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"short")
+    
+    with open(src, "rb") as s, open(tmp_path / "dst.bin", "wb") as d:
+        with pytest.raises(IOError):
+            copy_payload(s.fileno(), d.fileno(), 100, offset=0)
@@ -0,0 +1,53 @@
+import pytest
+from app.core.models.mod import Mod
+
+
+def loaded_from_disk(metadata, description=""):
+    calls = []
+    def loader():
+        calls.append("metadata")
+        return dict(metadata), None
+    def description_loader():
+        calls.append("description")
+        return description
+    return loader, description_loader, calls
+
+
+def test_fields_are_extracted_once():
+    mod = Mod("Cool", "/mods/Cool", metadata={"title": "Cool Mod", "author": "me", "version": "1.0", "requirements": ["Base>=1.0", 5]})
+    assert (mod.title, mod.author, mod.version) == ("Cool Mod", "me", "1.0")
+    assert [req.mod_name for req in mod.parsed_requirements] == ["Base"]
+
+
+def test_lazy_mod_loads_on_first_field_access():
+    loader, description_loader, calls = loaded_from_disk({"title": "Disk"}, "From disk")
+    mod = Mod("Cool", "/mods/Cool", loader=loader, description_loader=description_loader)
+    assert not mod.is_loaded
+    assert mod.title == "Disk"
+    assert mod.description == "From disk"
+    assert calls == ["metadata", "description"]
+
+
+def test_apply_metadata_refreshes_the_extracted_fields():
+    loader, description_loader, _ = loaded_from_disk({"title": "Disk"}, "From disk")
+    mod = Mod("Cool", "/mods/Cool", metadata={"title": "Old"}, loader=loader, description_loader=description_loader)
+    
+    mod.apply_metadata({"title": "New", "requirements": ["Base"]})
+    
+    assert mod.title == "New"
+    assert [req.mod_name for req in mod.parsed_requirements] == ["Base"]
+    # The dict is not kept; the description still comes from disk
+    assert mod.description == "From disk"
+
+
+def test_metadata_cannot_be_assigned():
+    mod = Mod("Cool", "/mods/Cool", metadata={})
+    with pytest.raises(AttributeError):
+        mod.metadata = {"title": "set"}
+
+
+def test_mod_without_loader_keeps_its_metadata():
+    mod = Mod("Cool", "/mods/Cool", metadata={"title": "Cool Mod", "description": "Hello"})
+    mod.apply_metadata({"title": "New", "description": "Bye"})
+    assert mod.metadata == {"title": "New", "description": "Bye"}
+    assert mod.description == "Bye"
@@ -0,0 +1,197 @@
+import random
+import pytest
+from app.core.models.mod import Mod
+from app.core.models.mod_list import ModList
+from app.core.models.mod_list_changes import ModListChanges
+
+
+def make_list(enabled, disabled=()):
+    mods = [Mod(name, f"/mods/{name}", enabled=True, metadata={}) for name in enabled]
+    mods += [Mod(name, f"/mods/{name}", metadata={}) for name in disabled]
+    mod_list = ModList(mods)
+    changes = []
+    mod_list.add_observer(changes.append)
+    return mod_list, changes
+
+
+def test_move_up_reports_both_swapped_mods():
+    mod_list, changes = make_list(["a", "lib", "c"])
+    mod_list.move_up("lib")
+    assert mod_list.enabled_mod_names == ["lib", "a", "c"]
+    assert changes[-1].moved == {"lib", "a"}
+    assert changes[-1].reordered
+
+
+def test_move_down_reports_both_swapped_mods():
+    mod_list, changes = make_list(["a", "lib", "c"])
+    mod_list.move_down("lib")
+    assert mod_list.enabled_mod_names == ["a", "c", "lib"]
+    assert changes[-1].moved == {"lib", "c"}
+
+
+def test_moves_past_the_ends_do_nothing():
+    mod_list, changes = make_list(["a", "b"])
+    mod_list.move_up("a")
+    mod_list.move_down("b")
+    assert changes == []
+
+
+def test_move_to_top_reports_only_the_moved_mod():
+    mod_list, changes = make_list(["a", "b", "c"])
+    mod_list.move_to_top("c")
+    assert mod_list.enabled_mod_names == ["c", "a", "b"]
+    assert changes[-1].moved == {"c"}
+
+
+def test_batch_notifies_once_with_merged_changes():
+    mod_list, changes = make_list(["a"], ["b", "c"])
+    with mod_list.batch():
+        mod_list.enable_mod("b")
+        mod_list.enable_mod("c")
+        assert changes == []
+    assert len(changes) == 1
+    assert changes[0].enabled == {"b", "c"}
+    assert not changes[0].from_disk
+
+
+def test_enable_then_disable_in_a_batch_cancels_out():
+    mod_list, changes = make_list(["a"], ["b"])
+    with mod_list.batch():
+        mod_list.enable_mod("b")
+        mod_list.disable_mod("b")
+    assert changes == []
+
+
+def test_nested_batches_notify_only_at_the_outermost():
+    mod_list, changes = make_list(["a"], ["b"])
+    with mod_list.batch():
+        with mod_list.batch():
+            mod_list.enable_mod("b")
+        assert changes == []
+    assert [c.enabled for c in changes] == [{"b"}]
+
+
+def test_wholesale_reorder_in_a_batch_clears_moved():
+    mod_list, changes = make_list(["a", "b", "c"])
+    with mod_list.batch():
+        mod_list.move_up("b")
+        mod_list.set_order(["c", "b", "a"])
+    assert changes[-1].reordered
+    assert changes[-1].moved == set()
+
+
+def test_moves_after_a_wholesale_reorder_keep_moved_empty():
+    mod_list, changes = make_list(["a", "b", "c"])
+    with mod_list.batch():
+        mod_list.set_order(["c", "b", "a"])
+        mod_list.move_up("a")
+    assert changes[-1].reordered
+    assert changes[-1].moved == set()
+
+
+def test_moves_in_a_batch_union_their_moved_mods():
+    mod_list, changes = make_list(["a", "b", "c", "d"])
+    with mod_list.batch():
+        mod_list.move_up("b")
+        mod_list.move_to_top("d")
+    assert changes[-1].moved == {"a", "b", "d"}
+
+
+def test_merge_cancels_an_add_followed_by_a_remove():
+    changes = ModListChanges(added={"a"})
+    changes.merge(ModListChanges(removed={"a"}, from_disk=True))
+    assert changes.is_empty
+    assert not changes.from_disk
+
+
+def test_merge_turns_a_remove_followed_by_an_add_into_an_update():
+    changes = ModListChanges(removed={"a"}, from_disk=True)
+    changes.merge(ModListChanges(added={"a"}, from_disk=True))
+    assert (changes.added, changes.removed, changes.updated) == (set(), set(), {"a"})
+    assert changes.from_disk
+
+
+class _Reference:
+    """The plain list scans ModList's index and caches have to agree with."""
+    
+    def __init__(self, mods):
+        self.mods = [[mod.name, mod.enabled, mod.missing] for mod in mods]
+    
+    def enabled(self):
+        return [m for m in self.mods if m[1]]
+    
+    def find(self, name):
+        return next((m for m in self.mods if m[0] == name), None)
+    
+    def enable_mod(self, name):
+        mod = self.find(name)
+        if mod:
+            mod[1] = True
+    
+    def disable_mod(self, name):
+        mod = self.find(name)
+        if mod:
+            mod[1] = False
+    
+    def _swap(self, name, step):
+        enabled = self.enabled()
+        index = next((i for i, m in enumerate(enabled) if m[0] == name), None)
+        if index is not None and 0 <= index + step < len(enabled):
+            a, b = self.mods.index(enabled[index]), self.mods.index(enabled[index + step])
+            self.mods[a], self.mods[b] = self.mods[b], self.mods[a]
+    
+    def move_up(self, name):
+        self._swap(name, -1)
+    
+    def move_down(self, name):
+        self._swap(name, 1)
+    
+    def move_to_top(self, name):
+        mod = self.find(name)
+        if mod and mod[1]:
+            self.mods.remove(mod)
+            index = next((i for i, m in enumerate(self.mods) if m[1]), len(self.mods))
+            self.mods.insert(index, mod)
+    
+    def move_to_bottom(self, name):
+        mod = self.find(name)
+        if mod and mod[1]:
+            self.mods.remove(mod)
+            index = next((i for i in range(len(self.mods) - 1, -1, -1) if self.mods[i][1]), -1)
+            self.mods.insert(index + 1, mod)
+    
+    def set_order(self, names):
+        enabled = self.enabled()
+        ordered = [m for name in dict.fromkeys(names) for m in enabled if m[0] == name]
+        self.mods = ordered + [m for m in enabled if m not in ordered] + [m for m in self.mods if not m[1]]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_indexed_list_matches_linear_scans(seed):
+    rng = random.Random(seed)
+    names = [f"mod{i}" for i in range(8)]
+    mods = [Mod(name, f"/mods/{name}", enabled=rng.random() < 0.6, missing=rng.random() < 0.15, metadata={}) for name in names]
+    mod_list = ModList(mods)
+    reference = _Reference(mods)
+    operations = ["enable_mod", "disable_mod", "move_up", "move_down", "move_to_top", "move_to_bottom", "set_order"]
+    
+    for _ in range(60):
+        operation = rng.choice(operations)
+        if operation == "set_order":
+            argument = rng.sample(names + ["unknown"], rng.randint(0, 9))
+        else:
+            argument = rng.choice(names + ["unknown"])
+        getattr(mod_list, operation)(argument)
+        getattr(reference, operation)(argument)
+        
+        enabled = [m[0] for m in reference.enabled()]
+        assert [m.name for m in mod_list.all_mods] == [m[0] for m in reference.mods]
+        assert mod_list.enabled_mod_names == enabled
+        assert [m.name for m in mod_list.enabled_mods] == [m[0] for m in reference.enabled() if not m[2]]
+        assert [m.name for m in mod_list.disabled_mods] == [m[0] for m in reference.mods if not m[1]]
+        assert [m.name for m in mod_list.missing_mods] == [m[0] for m in reference.enabled() if m[2]]
+        for name in names:
+            expected = enabled.index(name) if name in enabled and not reference.find(name)[2] else None
+            assert mod_list.load_position(name) == expected
+            assert mod_list.get_mod_by_name(name).name == name
+        assert mod_list.get_mod_by_name("unknown") is None
@@ -0,0 +1,103 @@
+import json
+from app.infrastructure.mod_folder_watcher import _is_metadata_file
+from app.infrastructure.mod_repository import ModRepository
+
+
+def _make_mod(mod_folder, name, filename, metadata):
+    mod_dir = mod_folder / name
+    mod_dir.mkdir()
+    (mod_dir / filename).write_text(json.dumps(metadata), encoding="utf-8")
+    return mod_dir
+
+
+def test_mixed_case_description_file_is_found(tmp_path):
+    _make_mod(tmp_path, "CoolMod", "Description.json", {"title": "Cool Mod", "version": "1.2"})
+    repo = ModRepository(str(tmp_path))
+    
+    entry = repo.scan().get("CoolMod")
+    assert entry.desc_path is not None
+    assert entry.desc_path.endswith("Description.json")
+    
+    metadata, _ = repo.load_mod_metadata("CoolMod", entry)
+    assert metadata["title"] == "Cool Mod"
+
+
+def test_exact_case_description_file_is_preferred(tmp_path):
+    mod_dir = _make_mod(tmp_path, "CoolMod", "description.json", {"title": "Exact"})
+    (mod_dir / "DESCRIPTION.JSON").write_text(json.dumps({"title": "Upper"}), encoding="utf-8")
+    repo = ModRepository(str(tmp_path))
+    
+    metadata, _ = repo.load_mod_metadata("CoolMod")
+    assert metadata["title"] == "Exact"
+
+
+def test_watcher_treats_mixed_case_description_as_metadata():
+    assert _is_metadata_file("Description.json")
+    assert _is_metadata_file("INFO.JSON")
+    assert _is_metadata_file("Preview.PNG")
+    assert not _is_metadata_file("readme.txt")
+
+
+def test_metadata_cache_leaves_descriptions_out(tmp_path):
+    _make_mod(tmp_path, "CoolMod", "description.json", {"title": "Cool Mod", "description": "x" * 1000})
+    repo = ModRepository(str(tmp_path))
+    
+    metadata, _ = repo.load_mod_metadata("CoolMod")
+    assert "description" not in metadata
+    assert all("description" not in entry["metadata"] for entry in repo._metadata_cache.values())
+    assert repo.load_mod_description("CoolMod") == "x" * 1000
+
+
+def test_description_is_read_without_listing_the_mod_directory(tmp_path, monkeypatch):
+    from app.core.services.mod_service import ModService
+    import app.infrastructure.mod_repository as mod_repository
+    
+    _make_mod(tmp_path, "CoolMod", "description.json", {"title": "Cool Mod", "description": "Hello"})
+    (tmp_path / "modlist.txt").write_text("CoolMod\n", encoding="utf-8")
+    mod = ModService(ModRepository(str(tmp_path))).load_mods().get_mod_by_name("CoolMod")
+    
+    scans = []
+    real_scandir = mod_repository.os.scandir
+    monkeypatch.setattr(mod_repository.os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+    
+    assert mod.description == "Hello"
+    assert scans == []
+
+
+def test_external_modlist_edit_wins_over_a_pending_save(tmp_path):
+    repo = ModRepository(str(tmp_path))
+    (tmp_path / "modlist.txt").write_text("A\nB\n", encoding="utf-8")
+    assert repo.load_enabled_mod_names() == ["A", "B"]
+    
+    repo.save_enabled_mod_names(["B", "A"], delay=60)
+    (tmp_path / "modlist.txt").write_text("C\n", encoding="utf-8")
+    
+    assert repo.modlist_changed_externally()
+    assert repo.load_enabled_mod_names() == ["C"]
+    repo.flush()
+    assert (tmp_path / "modlist.txt").read_text(encoding="utf-8") == "C\n"
+
+
+def test_pending_save_is_not_written_over_an_external_edit(tmp_path):
+    repo = ModRepository(str(tmp_path))
+    (tmp_path / "modlist.txt").write_text("A\nB\n", encoding="utf-8")
+    repo.load_enabled_mod_names()
+    
+    repo.save_enabled_mod_names(["B", "A"], delay=60)
+    (tmp_path / "modlist.txt").write_text("C\n", encoding="utf-8")
+    repo.flush()
+    
+    assert (tmp_path / "modlist.txt").read_text(encoding="utf-8") == "C\n"
+    assert repo.modlist_changed_externally()
+
+
+def test_own_modlist_saves_are_not_external_changes(tmp_path):
+    repo = ModRepository(str(tmp_path))
+    repo.load_enabled_mod_names()
+    
+    repo.save_enabled_mod_names(["A", "B"], delay=60)
+    assert repo.load_enabled_mod_names() == ["A", "B"]
+    repo.flush()
+    
+    assert (tmp_path / "modlist.txt").read_text(encoding="utf-8") == "A\nB\n"
+    assert not repo.modlist_changed_externally()
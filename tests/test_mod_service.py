@@ -0,0 +1,246 @@
+import json
+import random
+import shutil
+import pytest
+from app.core.models.mod import Mod
+from app.core.models.mod_folder_changes import ModFolderChanges
+from app.core.models.mod_list import ModList
+from app.core.services.mod_service import ModService
+from app.infrastructure.mod_repository import ModRepository
+
+
+def _make_mod(mod_folder, name, metadata=None):
+    mod_dir = mod_folder / name
+    mod_dir.mkdir()
+    (mod_dir / "description.json").write_text(json.dumps(metadata or {"title": name}), encoding="utf-8")
+    return mod_dir
+
+
+@pytest.fixture
+def mod_folder(tmp_path):
+    for name in ("a", "b", "c", "d"):
+        _make_mod(tmp_path, name)
+    (tmp_path / "modlist.txt").write_text("a\nb\n", encoding="utf-8")
+    return tmp_path
+
+
+def load(mod_folder):
+    service = ModService(ModRepository(str(mod_folder)))
+    mod_list = service.load_mods()
+    changes = []
+    mod_list.add_observer(changes.append)
+    return service, mod_list, changes
+
+
+def test_reconcile_marks_a_removed_enabled_mod_missing(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    shutil.rmtree(mod_folder / "b")
+    
+    result = service.reconcile(mod_list, ModFolderChanges(removed={"b"}))
+    
+    mod = mod_list.get_mod_by_name("b")
+    assert mod.missing and mod.enabled
+    assert mod.title == "b"
+    assert mod.metadata == {}
+    assert mod.preview_path is None
+    assert mod_list.enabled_mod_names == ["a", "b"]
+    assert [m.name for m in mod_list.missing_mods] == ["b"]
+    assert result.removed == {"b"}
+    assert result.from_disk and not result.reordered
+    assert changes == [result]
+
+
+def test_reconcile_drops_a_removed_disabled_mod(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    shutil.rmtree(mod_folder / "c")
+    
+    result = service.reconcile(mod_list, ModFolderChanges(removed={"c"}))
+    
+    assert mod_list.get_mod_by_name("c") is None
+    assert [m.name for m in mod_list.all_mods] == ["a", "b", "d"]
+    assert result.removed == {"c"}
+    assert changes == [result]
+
+
+def test_reconcile_ignores_a_removal_whose_folder_is_back(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    
+    result = service.reconcile(mod_list, ModFolderChanges(removed={"b", "c"}))
+    
+    assert result.is_empty
+    assert changes == []
+    assert not mod_list.get_mod_by_name("b").missing
+
+
+def test_reconcile_inserts_an_added_mod_in_name_order(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    _make_mod(mod_folder, "bb", {"title": "New"})
+    
+    result = service.reconcile(mod_list, ModFolderChanges(added={"bb"}))
+    
+    assert [m.name for m in mod_list.all_mods] == ["a", "b", "bb", "c", "d"]
+    assert mod_list.get_mod_by_name("bb").title == "New"
+    assert not mod_list.get_mod_by_name("bb").enabled
+    assert result.added == {"bb"}
+
+
+def test_reconcile_refreshes_a_modified_mod(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    (mod_folder / "a" / "description.json").write_text(json.dumps({"title": "Renamed"}), encoding="utf-8")
+    
+    result = service.reconcile(mod_list, ModFolderChanges(modified={"a"}))
+    
+    assert mod_list.get_mod_by_name("a").title == "Renamed"
+    assert result.updated == {"a"}
+    assert not result.reordered
+
+
+def test_reconcile_restores_a_missing_mod_whose_folder_returns(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    shutil.rmtree(mod_folder / "b")
+    service.reconcile(mod_list, ModFolderChanges(removed={"b"}))
+    _make_mod(mod_folder, "b", {"title": "Back"})
+    
+    service.reconcile(mod_list, ModFolderChanges(added={"b"}))
+    
+    mod = mod_list.get_mod_by_name("b")
+    assert not mod.missing and mod.enabled
+    assert mod.title == "Back"
+    assert mod_list.missing_mods == []
+
+
+def test_reconcile_applies_an_edited_modlist(mod_folder):
+    service, mod_list, changes = load(mod_folder)
+    (mod_folder / "modlist.txt").write_text("d\na\n", encoding="utf-8")
+    
+    result = service.reconcile(mod_list, ModFolderChanges(modlist_changed=True))
+    
+    assert mod_list.enabled_mod_names == ["d", "a"]
+    assert [m.name for m in mod_list.disabled_mods] == ["b", "c"]
+    assert result.reordered
+
+
+def make_mod(name, requirements=(), version="1.0", **kwargs):
+    return Mod(name, f"/mods/{name}", metadata={"version": version, "requirements": list(requirements)}, **kwargs)
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ModService(ModRepository(str(tmp_path)))
+
+
+def test_resolve_places_new_mods_before_the_first_mod_needing_them(service):
+    mod_list = ModList([
+        make_mod("base", enabled=True),
+        make_mod("app", ["lib"], enabled=True),
+        make_mod("tail", enabled=True),
+        make_mod("lib", ["core>=1.0"]),
+        make_mod("core"),
+    ])
+    
+    resolution = service.resolve_requirements(mod_list, ["app"])
+    
+    assert resolution.to_enable == ["core", "lib"]
+    assert resolution.order == ["base", "core", "lib", "app", "tail"]
+    assert resolution.is_satisfiable
+    assert mod_list.enabled_mod_names == ["base", "app", "tail"]
+
+
+def test_resolve_reports_a_missing_dependency(service):
+    mod_list = ModList([
+        make_mod("base", enabled=True),
+        make_mod("gone", enabled=True, missing=True),
+        make_mod("app", ["lib", "gone"]),
+        make_mod("lib", ["ghost>=1.0"]),
+    ])
+    
+    resolution = service.resolve_requirements(mod_list, ["app", "nothere"])
+    
+    assert resolution.to_enable == ["lib", "app"]
+    assert resolution.order == ["base", "gone", "lib", "app"]
+    assert sorted(resolution.conflicts) == [
+        "app: Required mod 'gone' is not installed",
+        "lib: Required mod 'ghost' is not installed",
+        "nothere: Mod is not installed",
+    ]
+    assert not resolution.is_satisfiable
+
+
+def test_resolve_reports_an_unsatisfied_version(service):
+    mod_list = ModList([make_mod("app", ["core>=2.0"]), make_mod("core", version="1.5")])
+    
+    resolution = service.resolve_requirements(mod_list, ["app"])
+    
+    assert resolution.order == ["core", "app"]
+    assert resolution.conflicts == ["app: Required mod 'core' version 1.5 does not satisfy >=2.0"]
+
+
+def test_resolve_reports_a_cycle_and_still_orders_every_mod(service):
+    mod_list = ModList([
+        make_mod("base", enabled=True),
+        make_mod("app", ["x"]),
+        make_mod("x", ["y"]),
+        make_mod("y", ["x"]),
+    ])
+    
+    resolution = service.resolve_requirements(mod_list, ["app"])
+    
+    # app only needs x, so it may come before the rest of the cycle
+    assert resolution.to_enable == ["x", "app", "y"]
+    assert resolution.order == ["base", "x", "app", "y"]
+    assert resolution.conflicts == ["Circular dependency between x, y"]
+
+
+def test_resolve_ignores_cycles_outside_the_wanted_mods(service):
+    mod_list = ModList([
+        make_mod("x", ["y"], enabled=True),
+        make_mod("y", ["x"], enabled=True),
+        make_mod("app", ["lib"]),
+        make_mod("lib"),
+    ])
+    
+    resolution = service.resolve_requirements(mod_list, ["app"])
+    
+    assert resolution.to_enable == ["lib", "app"]
+    # The cycle is only broken once no other mod is ready
+    assert resolution.order == ["lib", "app", "x", "y"]
+    assert resolution.is_satisfiable
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_revalidation_matches_a_full_validation(service, seed):
+    rng = random.Random(seed)
+    names = [f"mod{i}" for i in range(rng.randint(2, 10))]
+    
+    def requirements():
+        targets = (rng.choice(names + ["ghost"]) for _ in range(rng.randint(0, 3)))
+        return [rng.choice([name, f"{name}>=1.0", {"mod": name, "version": "<2"}, "not valid"]) for name in targets]
+    
+    mods = [
+        make_mod(name, requirements(), rng.choice(["1.0", "2.5", "0.9", ""]), enabled=rng.random() < 0.7, missing=rng.random() < 0.1)
+        for name in names
+    ]
+    mod_list = ModList(mods)
+    service.validate_requirements(mod_list)
+    mod_list.add_observer(lambda changes: service.revalidate_requirements(mod_list, changes))
+    
+    for _ in range(40):
+        name = rng.choice(names)
+        step = rng.random()
+        if step < 0.5:
+            getattr(mod_list, rng.choice(["move_up", "move_down", "move_to_top", "move_to_bottom"]))(name)
+        elif step < 0.8 and mod_list.get_mod_by_name(name).enabled:
+            mod_list.disable_mod(name)
+        elif step < 0.8:
+            mod_list.enable_mod(name)
+        else:
+            with mod_list.batch():
+                mod_list.move_up(name)
+                if rng.random() < 0.5:
+                    mod_list.set_order(rng.sample(mod_list.enabled_mod_names, len(mod_list.enabled_mod_names)))
+                mod_list.enable_mod(rng.choice(names))
+        
+        errors = service.get_requirement_errors(mod_list)
+        flags = [mod.has_unmet_requirements for mod in mod_list.all_mods]
+        assert service.validate_requirements(mod_list) == errors
+        assert [mod.has_unmet_requirements for mod in mod_list.all_mods] == flags
@@ -0,0 +1,142 @@
+import os
+import threading
+import pytest
+from app.core.services.pack_service import MANIFEST_NAME, PackCancelled, PackService
+from app.infrastructure.gpak_archive import GpakArchive
+
+
+# Deliberately not in path order, like the game's own archive
+FILES = [
+    ("swfs/ui.swf", b"\x00\x01\x02" * 100),
+    ("data/b.txt", b"bravo"),
+    ("data/a.txt", b"alpha!"),
+    ("textures/cat.png", b"meow" * 50),
+]
+
+
+@pytest.fixture
+def unpacked(tmp_path, write_gpak):
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    gpak = write_gpak(game_dir / "resources.gpak", FILES)
+    source = tmp_path / "_unpacked"
+    PackService().unpack(str(game_dir), str(source), workers=1)
+    return game_dir, gpak, source
+
+
+def read_all(gpak):
+    with GpakArchive(str(gpak), use_index=False) as archive:
+        return [(path, archive.read(path)) for path in archive.paths]
+
+
+def edit(path, data):
+    st = path.stat()
+    path.write_bytes(data)
+    # Make sure the mtime moves even on coarse-grained filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_unpack_writes_every_entry(unpacked):
+    _, _, source = unpacked
+    for path, data in FILES:
+        assert (source / path).read_bytes() == data
+    assert (source / MANIFEST_NAME).exists()
+
+
+def test_repack_without_edits_leaves_the_archive_alone(unpacked):
+    game_dir, gpak, source = unpacked
+    before = gpak.stat()
+    
+    PackService().repack(str(source), str(gpak))
+    
+    after = gpak.stat()
+    assert (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns)
+    assert read_all(gpak) == FILES
+
+
+def test_incremental_repack_round_trip(unpacked):
+    game_dir, gpak, source = unpacked
+    edit(source / "data/b.txt", b"bravo, edited")
+    (source / "data/new.txt").write_bytes(b"brand new")
+    
+    PackService().repack(str(source), str(gpak))
+    
+    expected = [(path, b"bravo, edited" if path == "data/b.txt" else data) for path, data in FILES]
+    assert read_all(gpak) == expected + [("data/new.txt", b"brand new")]
+    
+    # The manifest now describes the new archive, so a second repack is a no-op
+    before = gpak.stat()
+    PackService().repack(str(source), str(gpak))
+    assert gpak.stat().st_mtime_ns == before.st_mtime_ns
+
+
+def test_same_size_edit_is_not_reused_from_the_archive(unpacked):
+    _, gpak, source = unpacked
+    edit(source / "data/a.txt", b"ALPHA?")
+    
+    PackService().repack(str(source), str(gpak))
+    
+    assert dict(read_all(gpak))["data/a.txt"] == b"ALPHA?"
+
+
+def test_manifest_is_invalidated_when_the_archive_changes(unpacked):
+    _, gpak, source = unpacked
+    service = PackService()
+    assert service._load_manifest(source, gpak)
+    
+    st = gpak.stat()
+    os.utime(gpak, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert service._load_manifest(source, gpak) == {}
+    
+    # Without a manifest every payload is read from the loose files again
+    edit(source / "data/b.txt", b"BRAVO")
+    service.repack(str(source), str(gpak))
+    expected = [(path, b"BRAVO" if path == "data/b.txt" else data) for path, data in FILES]
+    assert read_all(gpak) == expected
+
+
+def test_write_patch_holds_only_changed_files(unpacked, tmp_path):
+    _, gpak, source = unpacked
+    edit(source / "data/a.txt", b"alpha, patched")
+    (source / "data/new.txt").write_bytes(b"brand new")
+    patch = tmp_path / "patch.gpak"
+    
+    written = PackService().write_patch(str(source), str(gpak), str(patch))
+    
+    assert written == ["data/a.txt", "data/new.txt"]
+    assert read_all(patch) == [("data/a.txt", b"alpha, patched"), ("data/new.txt", b"brand new")]
+    assert read_all(gpak) == FILES
+
+
+def test_repack_appends_new_files_after_the_archive_order(unpacked):
+    _, gpak, source = unpacked
+    (source / "aaa.txt").write_bytes(b"first by name")
+    
+    PackService().repack(str(source), str(gpak))
+    
+    assert read_all(gpak) == FILES + [("aaa.txt", b"first by name")]
+
+
+def test_cancelled_unpack_removes_only_what_it_created(tmp_path, write_gpak):
+    game_dir = tmp_path / "game"
+    game_dir.mkdir()
+    write_gpak(game_dir / "resources.gpak", FILES)
+    out = tmp_path / "_unpacked"
+    (out / "data").mkdir(parents=True)
+    (out / "data/a.txt").write_bytes(b"mine")
+    (out / "data/notes.txt").write_bytes(b"also mine")
+    
+    cancel = threading.Event()
+    done = []
+    def progress(pack_progress):
+        done.append(pack_progress)
+        if len(done) == 3:
+            cancel.set()
+    
+    with pytest.raises(PackCancelled):
+        PackService().unpack(str(game_dir), str(out), progress, workers=1, cancel_event=cancel)
+    
+    assert (out / "data/a.txt").exists()
+    assert (out / "data/notes.txt").read_bytes() == b"also mine"
+    assert not (out / "swfs").exists()
+    assert not (out / "data/b.txt").exists()
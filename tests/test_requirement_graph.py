@@ -0,0 +1,85 @@
+from app.core.models.mod import Mod
+from app.core.models.mod_list import ModList
+from app.core.models.requirement_graph import RequirementGraph
+
+
+def make_mod(name, version="1.0", requirements=(), **kwargs):
+    return Mod(name, f"/mods/{name}", metadata={"version": version, "requirements": list(requirements)}, **kwargs)
+
+
+def test_node_is_reused_while_metadata_is_unchanged():
+    graph = RequirementGraph()
+    mod = make_mod("app", requirements=["lib>=1.0"])
+    
+    node = graph.node(mod)
+    assert graph.node(mod) is node
+    assert node.dependencies == ["lib"]
+    assert node.version_parts == (1, 0)
+
+
+def test_node_is_rebuilt_after_apply_metadata():
+    graph = RequirementGraph()
+    mod = make_mod("app", requirements=["lib"])
+    node = graph.node(mod)
+    
+    mod.apply_metadata({"version": "1.0", "requirements": ["core"]})
+    
+    rebuilt = graph.node(mod)
+    assert rebuilt is not node
+    assert rebuilt.dependencies == ["core"]
+    assert graph.dependents("lib") == set()
+    assert graph.dependents("core") == {"app"}
+
+
+def test_node_is_rebuilt_after_a_version_change():
+    graph = RequirementGraph()
+    lib = make_mod("lib", version="1.0")
+    edge = graph.node(make_mod("app", requirements=["lib>=2.0"])).edges[0]
+    assert not graph.satisfies(edge, graph.node(lib))
+    
+    lib.apply_metadata({"version": "2.1"})
+    
+    assert graph.node(lib).version_parts == (2, 1)
+    assert graph.satisfies(edge, graph.node(lib))
+
+
+def test_dependents_track_every_requiring_mod():
+    graph = RequirementGraph()
+    graph.node(make_mod("a", requirements=["lib"]))
+    graph.node(make_mod("b", requirements=["lib>=1.0", "core"]))
+    assert graph.dependents("lib") == {"a", "b"}
+    assert graph.dependents("core") == {"b"}
+    
+    graph.discard("b")
+    assert graph.dependents("lib") == {"a"}
+    assert graph.dependents("core") == set()
+    
+    graph.clear()
+    assert graph.dependents("lib") == set()
+
+
+def test_unloaded_mods_are_not_read_until_looked_up():
+    calls = []
+    
+    def loader():
+        calls.append("lib")
+        return {"version": "1.0"}, None
+    
+    mod_list = ModList([make_mod("app", requirements=["lib"], enabled=True), Mod("lib", "/mods/lib", loader=loader)])
+    mod_list.requirement_graph.node(mod_list.get_mod_by_name("app"))
+    assert calls == []
+    
+    mod_list.requirement_graph.node(mod_list.get_mod_by_name("lib"))
+    assert calls == ["lib"]
+
+
+def test_patch_forgets_dropped_mods():
+    mod_list = ModList([make_mod("app", requirements=["lib"]), make_mod("lib")])
+    graph = mod_list.requirement_graph
+    for mod in mod_list.all_mods:
+        graph.node(mod)
+    
+    mod_list.patch(removed={"app"})
+    
+    assert mod_list.get_mod_by_name("app") is None
+    assert graph.dependents("lib") == set()
@@ -0,0 +1,37 @@
+from app.utils.topo_sort import find_cycles, topological_sort
+
+
+def test_dependencies_come_first():
+    order, cycles = topological_sort(["c", "b", "a"], {"c": ["b"], "b": ["a"]})
+    assert order == ["a", "b", "c"]
+    assert cycles == []
+
+
+def test_ties_are_broken_by_key():
+    order, _ = topological_sort(["B", "a", "C"], {})
+    assert order == ["a", "B", "C"]
+
+
+def test_node_depending_on_a_cycle_is_placed_after_it():
+    order, cycles = topological_sort(["b", "x", "y"], {"b": ["x"], "x": ["y"], "y": ["x"]})
+    assert order.index("x") < order.index("b")
+    assert cycles == [["x", "y"]]
+
+
+def test_cycle_is_broken_only_after_its_outside_dependencies():
+    dependencies = {"a": ["b", "z"], "b": ["a"], "z": ["y"], "y": []}
+    order, cycles = topological_sort(["a", "b", "y", "z"], dependencies)
+    assert order.index("z") < order.index("a")
+    assert order.index("z") < order.index("b")
+    assert cycles == [["a", "b"]]
+
+
+def test_unknown_and_self_dependencies_are_ignored():
+    order, cycles = topological_sort(["a", "b"], {"a": ["a", "missing"], "b": ["a"]})
+    assert order == ["a", "b"]
+    assert cycles == []
+
+
+def test_find_cycles_lists_each_cycle_sorted():
+    cycles = find_cycles(["d", "c", "b", "a"], {"a": ["b"], "b": ["a"], "d": ["c"], "c": ["d"]})
+    assert cycles == [["a", "b"], ["c", "d"]]